@@ -1,10 +1,12 @@
 """Agent schemas and components for CodeGuard AI."""
 
 from app.agents.base import BaseAgent
+from app.agents.combined_agent import CombinedAnalysisAgent
 from app.agents.critique import CritiqueAgent
 from app.agents.formatter import CommentFormatter
 from app.agents.logic_agent import LogicAgent
 from app.agents.prompts import (
+    COMBINED_AGENT_PROMPT,
     CRITIQUE_AGENT_PROMPT,
     LOGIC_AGENT_PROMPT,
     QUALITY_AGENT_PROMPT,
@@ -12,7 +14,13 @@ from app.agents.prompts import (
     format_prompt,
 )
 from app.agents.quality_agent import QualityAgent
-from app.agents.schemas import AgentFinding, AgentResponse, CritiqueResponse, ReviewState
+from app.agents.schemas import (
+    AgentFinding,
+    AgentResponse,
+    CombinedResponse,
+    CritiqueResponse,
+    ReviewState,
+)
 from app.agents.security_agent import SecurityAgent
 from app.agents.supervisor import ReviewSupervisor, create_review_graph
 
@@ -20,6 +28,8 @@ __all__ = [
     "AgentFinding",
     "AgentResponse",
     "BaseAgent",
+    "CombinedAnalysisAgent",
+    "CombinedResponse",
     "CommentFormatter",
     "CritiqueAgent",
     "CritiqueResponse",
@@ -29,6 +39,7 @@ __all__ = [
     "ReviewSupervisor",
     "SecurityAgent",
     "create_review_graph",
+    "COMBINED_AGENT_PROMPT",
     "CRITIQUE_AGENT_PROMPT",
     "LOGIC_AGENT_PROMPT",
     "SECURITY_AGENT_PROMPT",
@@ -57,3 +57,24 @@ class BaseAgent:
         prompt = format_prompt(self.prompt_template, diff, files, file_contents)
         response = self.llm_service.invoke_structured(prompt, AgentResponse)
         return response.findings
+
+    async def analyze_async(
+        self,
+        diff: str,
+        files: List[str],
+        file_contents: Optional[Dict[str, str]] = None,
+    ) -> List[AgentFinding]:
+        """Async variant of analyze that awaits the LLM call.
+
+        Args:
+            diff: The code diff to analyze.
+            files: List of file paths changed in the PR.
+            file_contents: Optional mapping of file paths to their full content
+                for context-aware analysis.
+
+        Returns:
+            List of AgentFinding objects representing issues found.
+        """
+        prompt = format_prompt(self.prompt_template, diff, files, file_contents)
+        response = await self.llm_service.ainvoke_structured(prompt, AgentResponse)
+        return response.findings
@@ -0,0 +1,88 @@
+"""Combined Analysis Agent covering logic, security, and quality in one LLM call."""
+
+from typing import Dict, List, Optional
+
+from app.agents.prompts import COMBINED_AGENT_PROMPT, format_prompt
+from app.agents.schemas import AgentFinding, CombinedResponse
+from app.services.llm import LLMService
+
+
+class CombinedAnalysisAgent:
+    """Agent that does the work of the Logic, Security, and Quality agents at once.
+
+    For small diffs, one structured LLM call returning all three finding
+    lists is cheaper and faster than three separate round trips that each
+    resend the same diff. The supervisor only routes small diffs here.
+    """
+
+    def __init__(
+        self,
+        llm_service: Optional[LLMService] = None,
+        prompt_template: Optional[str] = None,
+    ):
+        """Initialize the Combined Analysis Agent.
+
+        Args:
+            llm_service: Optional LLM service. If not provided, creates a new instance.
+            prompt_template: Optional prompt template override.
+        """
+        self.prompt_template = prompt_template or COMBINED_AGENT_PROMPT
+        self.llm_service = llm_service if llm_service is not None else LLMService()
+
+    def analyze(
+        self,
+        diff: str,
+        files: List[str],
+        file_contents: Optional[Dict[str, str]] = None,
+    ) -> Dict[str, List[AgentFinding]]:
+        """Analyze code diff and return findings for all three categories.
+
+        Args:
+            diff: The code diff to analyze.
+            files: List of file paths changed in the PR.
+            file_contents: Optional mapping of file paths to their full content
+                for context-aware analysis.
+
+        Returns:
+            Dictionary with logic_findings, security_findings, and quality_findings keys
+        """
+        prompt = format_prompt(self.prompt_template, diff, files, file_contents)
+        response = self.llm_service.invoke_structured(prompt, CombinedResponse)
+        return self._to_findings(response)
+
+    async def analyze_async(
+        self,
+        diff: str,
+        files: List[str],
+        file_contents: Optional[Dict[str, str]] = None,
+    ) -> Dict[str, List[AgentFinding]]:
+        """Async variant of analyze that awaits the LLM call.
+
+        Args:
+            diff: The code diff to analyze.
+            files: List of file paths changed in the PR.
+            file_contents: Optional mapping of file paths to their full content
+                for context-aware analysis.
+
+        Returns:
+            Dictionary with logic_findings, security_findings, and quality_findings keys
+        """
+        prompt = format_prompt(self.prompt_template, diff, files, file_contents)
+        response = await self.llm_service.ainvoke_structured(prompt, CombinedResponse)
+        return self._to_findings(response)
+
+    @staticmethod
+    def _to_findings(response: CombinedResponse) -> Dict[str, List[AgentFinding]]:
+        """Split a CombinedResponse into per-category finding lists.
+
+        Args:
+            response: Structured response from the LLM
+
+        Returns:
+            Dictionary with one findings list per category
+        """
+        return {
+            "logic_findings": response.logic_findings,
+            "security_findings": response.security_findings,
+            "quality_findings": response.quality_findings,
+        }
@@ -41,20 +41,56 @@ class CritiqueAgent:
         Returns:
             CritiqueResponse with cleaned and improved findings
         """
+        prompt = self._build_prompt(logic_findings, security_findings, quality_findings)
+        response = self.llm_service.invoke_structured(prompt, CritiqueResponse)
+        return response
+
+    async def critique_async(
+        self,
+        logic_findings: List[AgentFinding],
+        security_findings: List[AgentFinding],
+        quality_findings: List[AgentFinding],
+    ) -> CritiqueResponse:
+        """Async variant of critique that awaits the LLM call.
+
+        Args:
+            logic_findings: Findings from the Logic Agent
+            security_findings: Findings from the Security Agent
+            quality_findings: Findings from the Quality Agent
+
+        Returns:
+            CritiqueResponse with cleaned and improved findings
+        """
+        prompt = self._build_prompt(logic_findings, security_findings, quality_findings)
+        return await self.llm_service.ainvoke_structured(prompt, CritiqueResponse)
+
+    def _build_prompt(
+        self,
+        logic_findings: List[AgentFinding],
+        security_findings: List[AgentFinding],
+        quality_findings: List[AgentFinding],
+    ) -> str:
+        """Build the critique prompt from all agents' findings.
+
+        Args:
+            logic_findings: Findings from the Logic Agent
+            security_findings: Findings from the Security Agent
+            quality_findings: Findings from the Quality Agent
+
+        Returns:
+            Formatted critique prompt
+        """
         # Format findings for the prompt
         logic_str = self._format_findings(logic_findings, "Logic")
         security_str = self._format_findings(security_findings, "Security")
         quality_str = self._format_findings(quality_findings, "Quality")
 
-        prompt = CRITIQUE_AGENT_PROMPT.format(
+        return CRITIQUE_AGENT_PROMPT.format(
             logic_findings=logic_str,
             security_findings=security_str,
             quality_findings=quality_str,
         )
 
-        response = self.llm_service.invoke_structured(prompt, CritiqueResponse)
-        return response
-
     def _format_findings(self, findings: List[AgentFinding], agent_name: str) -> str:
         """Format findings list as string for prompt.
 
@@ -37,6 +37,27 @@ class AgentResponse(BaseModel):
     summary: str = Field(description="Summary of the agent's analysis")
 
 
+class CombinedResponse(BaseModel):
+    """Response from the Combined Analysis Agent with findings per category."""
+
+    logic_findings: List[AgentFinding] = Field(
+        default_factory=list,
+        description="Logic errors and bugs. Return empty list if none found."
+    )
+    security_findings: List[AgentFinding] = Field(
+        default_factory=list,
+        description="Security vulnerabilities. Return empty list if none found."
+    )
+    quality_findings: List[AgentFinding] = Field(
+        default_factory=list,
+        description="Code quality issues. Return empty list if none found."
+    )
+    summary: str = Field(
+        default="",
+        description="Summary of the combined analysis"
+    )
+
+
 class CritiqueResponse(BaseModel):
     """Response from the Critique Agent with cleaned findings."""
 
@@ -1,9 +1,12 @@
 """LangGraph Supervisor for orchestrating parallel code review agents."""
 
+import functools
 from typing import List, Optional
 
+from langchain_core.runnables import RunnableConfig, RunnableLambda
 from langgraph.graph import END, START, StateGraph
 
+from app.agents.combined_agent import CombinedAnalysisAgent
 from app.agents.critique import CritiqueAgent
 from app.agents.formatter import CommentFormatter
 from app.agents.logic_agent import LogicAgent
@@ -11,38 +14,94 @@ from app.agents.quality_agent import QualityAgent
 from app.agents.schemas import AgentFinding, ReviewState
 from app.agents.security_agent import SecurityAgent
 
+# Diffs shorter than this (in characters) go to the combined agent, when one
+# is configured, instead of fanning out to the three specialized agents.
+COMBINED_DIFF_THRESHOLD = 4000
 
-def create_review_graph(
-    logic_agent: Optional[LogicAgent],
-    security_agent: Optional[SecurityAgent],
-    quality_agent: Optional[QualityAgent],
-    critique_agent: CritiqueAgent,
-):
-    """Create and compile the LangGraph review workflow.
+# State key of each specialized agent's findings -> its key in the run config
+_ANALYSIS_AGENTS = {
+    "logic_findings": "logic_agent",
+    "security_findings": "security_agent",
+    "quality_findings": "quality_agent",
+}
 
-    Creates a StateGraph that runs three specialized agents in parallel,
-    then runs the critique agent to deduplicate and improve findings,
-    and finally combines their findings into a formatted GitHub comment.
 
-    Args:
-        logic_agent: Agent for detecting logic errors
-        security_agent: Agent for identifying security vulnerabilities
-        quality_agent: Agent for reviewing code quality
-        critique_agent: Agent for deduplication and confidence scoring
+@functools.lru_cache(maxsize=1)
+def _compile_review_graph():
+    """Build and compile the review workflow once per process.
+
+    The nodes look up their agents in ``config["configurable"]`` at run time
+    instead of closing over them, so a single compiled graph can be shared by
+    every ReviewSupervisor.
 
     Returns:
-        Compiled LangGraph graph ready for invocation
+        Compiled LangGraph graph expecting the agents in its run config
     """
 
-    def run_logic(state: ReviewState) -> dict:
+    def route_analysis(state: ReviewState, config: RunnableConfig):
+        """Choose between the combined agent and the parallel fan-out.
+
+        Args:
+            state: Current review state with pr_diff
+            config: Run config carrying the agents under "configurable"
+
+        Returns:
+            "combined" for small diffs when a combined agent is configured and
+            at least one agent is enabled, otherwise the three agent nodes
+        """
+        configurable = config["configurable"]
+        if (
+            configurable.get("combined_agent") is not None
+            and len(state["pr_diff"]) < COMBINED_DIFF_THRESHOLD
+            # With every agent disabled the fan-out makes no LLM calls at all
+            and any(configurable.get(agent) is not None for agent in _ANALYSIS_AGENTS.values())
+        ):
+            return "combined"
+        return ["logic", "security", "quality"]
+
+    def _enabled_findings(findings: dict, config: RunnableConfig) -> dict:
+        """Drop combined-agent findings for categories whose agent is disabled."""
+        configurable = config["configurable"]
+        return {
+            key: findings[key] if configurable.get(agent) is not None else []
+            for key, agent in _ANALYSIS_AGENTS.items()
+        }
+
+    def run_combined(state: ReviewState, config: RunnableConfig) -> dict:
+        """Run the combined agent in place of the three specialized agents.
+
+        Args:
+            state: Current review state with pr_diff and pr_files
+            config: Run config carrying the agents under "configurable"
+
+        Returns:
+            Dictionary with logic_findings, security_findings, and quality_findings keys
+        """
+        combined_agent = config["configurable"]["combined_agent"]
+        findings = combined_agent.analyze(
+            state["pr_diff"], state["pr_files"], state.get("pr_file_contents")
+        )
+        return _enabled_findings(findings, config)
+
+    async def arun_combined(state: ReviewState, config: RunnableConfig) -> dict:
+        """Async variant of run_combined used by ainvoke."""
+        combined_agent = config["configurable"]["combined_agent"]
+        findings = await combined_agent.analyze_async(
+            state["pr_diff"], state["pr_files"], state.get("pr_file_contents")
+        )
+        return _enabled_findings(findings, config)
+
+    def run_logic(state: ReviewState, config: RunnableConfig) -> dict:
         """Run the logic agent and return findings.
 
         Args:
             state: Current review state with pr_diff and pr_files
+            config: Run config carrying the agents under "configurable"
 
         Returns:
             Dictionary with logic_findings key
         """
+        logic_agent = config["configurable"].get("logic_agent")
         if logic_agent is None:
             return {"logic_findings": []}
         findings = logic_agent.analyze(
@@ -50,15 +109,27 @@ def create_review_graph(
         )
         return {"logic_findings": findings}
 
-    def run_security(state: ReviewState) -> dict:
+    async def arun_logic(state: ReviewState, config: RunnableConfig) -> dict:
+        """Async variant of run_logic used by ainvoke."""
+        logic_agent = config["configurable"].get("logic_agent")
+        if logic_agent is None:
+            return {"logic_findings": []}
+        findings = await logic_agent.analyze_async(
+            state["pr_diff"], state["pr_files"], state.get("pr_file_contents")
+        )
+        return {"logic_findings": findings}
+
+    def run_security(state: ReviewState, config: RunnableConfig) -> dict:
         """Run the security agent and return findings.
 
         Args:
             state: Current review state with pr_diff and pr_files
+            config: Run config carrying the agents under "configurable"
 
         Returns:
             Dictionary with security_findings key
         """
+        security_agent = config["configurable"].get("security_agent")
         if security_agent is None:
             return {"security_findings": []}
         findings = security_agent.analyze(
@@ -66,15 +137,27 @@ def create_review_graph(
         )
         return {"security_findings": findings}
 
-    def run_quality(state: ReviewState) -> dict:
+    async def arun_security(state: ReviewState, config: RunnableConfig) -> dict:
+        """Async variant of run_security used by ainvoke."""
+        security_agent = config["configurable"].get("security_agent")
+        if security_agent is None:
+            return {"security_findings": []}
+        findings = await security_agent.analyze_async(
+            state["pr_diff"], state["pr_files"], state.get("pr_file_contents")
+        )
+        return {"security_findings": findings}
+
+    def run_quality(state: ReviewState, config: RunnableConfig) -> dict:
         """Run the quality agent and return findings.
 
         Args:
             state: Current review state with pr_diff and pr_files
+            config: Run config carrying the agents under "configurable"
 
         Returns:
             Dictionary with quality_findings key
         """
+        quality_agent = config["configurable"].get("quality_agent")
         if quality_agent is None:
             return {"quality_findings": []}
         findings = quality_agent.analyze(
@@ -82,15 +165,46 @@ def create_review_graph(
         )
         return {"quality_findings": findings}
 
-    def run_critique(state: ReviewState) -> dict:
+    async def arun_quality(state: ReviewState, config: RunnableConfig) -> dict:
+        """Async variant of run_quality used by ainvoke."""
+        quality_agent = config["configurable"].get("quality_agent")
+        if quality_agent is None:
+            return {"quality_findings": []}
+        findings = await quality_agent.analyze_async(
+            state["pr_diff"], state["pr_files"], state.get("pr_file_contents")
+        )
+        return {"quality_findings": findings}
+
+    def has_findings(state: ReviewState) -> bool:
+        """Whether any agent reported a finding worth critiquing."""
+        return bool(
+            state["logic_findings"] or state["security_findings"] or state["quality_findings"]
+        )
+
+    def unchanged_findings(state: ReviewState) -> dict:
+        """Write the findings back as-is; LangGraph rejects a node that writes nothing."""
+        return {
+            "logic_findings": state["logic_findings"],
+            "security_findings": state["security_findings"],
+            "quality_findings": state["quality_findings"],
+        }
+
+    def run_critique(state: ReviewState, config: RunnableConfig) -> dict:
         """Run the critique agent to improve findings.
 
+        With no findings there is nothing to deduplicate or reattribute, so
+        the LLM call is skipped and the (empty) findings are passed through.
+
         Args:
             state: Current review state with findings from all agents
+            config: Run config carrying the agents under "configurable"
 
         Returns:
             Dictionary with updated findings after deduplication and scoring
         """
+        if not has_findings(state):
+            return unchanged_findings(state)
+        critique_agent = config["configurable"]["critique_agent"]
         result = critique_agent.critique(
             logic_findings=state["logic_findings"],
             security_findings=state["security_findings"],
@@ -102,6 +216,22 @@ def create_review_graph(
             "quality_findings": result.quality_findings,
         }
 
+    async def arun_critique(state: ReviewState, config: RunnableConfig) -> dict:
+        """Async variant of run_critique used by ainvoke."""
+        if not has_findings(state):
+            return unchanged_findings(state)
+        critique_agent = config["configurable"]["critique_agent"]
+        result = await critique_agent.critique_async(
+            logic_findings=state["logic_findings"],
+            security_findings=state["security_findings"],
+            quality_findings=state["quality_findings"],
+        )
+        return {
+            "logic_findings": result.logic_findings,
+            "security_findings": result.security_findings,
+            "quality_findings": result.quality_findings,
+        }
+
     def combine_findings(state: ReviewState) -> dict:
         """Combine all findings and format the final comment.
 
@@ -121,19 +251,22 @@ def create_review_graph(
     # Create the state graph
     graph = StateGraph(ReviewState)
 
-    # Add nodes for each agent and the combiner
-    graph.add_node("logic", run_logic)
-    graph.add_node("security", run_security)
-    graph.add_node("quality", run_quality)
-    graph.add_node("critique", run_critique)
+    # Add nodes for each agent and the combiner. Agent nodes carry both a sync
+    # and an async implementation so the graph serves invoke and ainvoke.
+    graph.add_node("combined", RunnableLambda(run_combined, afunc=arun_combined))
+    graph.add_node("logic", RunnableLambda(run_logic, afunc=arun_logic))
+    graph.add_node("security", RunnableLambda(run_security, afunc=arun_security))
+    graph.add_node("quality", RunnableLambda(run_quality, afunc=arun_quality))
+    graph.add_node("critique", RunnableLambda(run_critique, afunc=arun_critique))
     graph.add_node("combine", combine_findings)
 
-    # Add edges: START -> all three agents (parallel)
-    graph.add_edge(START, "logic")
-    graph.add_edge(START, "security")
-    graph.add_edge(START, "quality")
+    # Add edges: START -> combined agent, or all three agents (parallel)
+    graph.add_conditional_edges(
+        START, route_analysis, ["combined", "logic", "security", "quality"]
+    )
 
-    # Add edges: all three agents -> critique
+    # Add edges: combined agent or all three agents -> critique
+    graph.add_edge("combined", "critique")
     graph.add_edge("logic", "critique")
     graph.add_edge("security", "critique")
     graph.add_edge("quality", "critique")
@@ -146,6 +279,44 @@ def create_review_graph(
     return graph.compile()
 
 
+def create_review_graph(
+    logic_agent: Optional[LogicAgent],
+    security_agent: Optional[SecurityAgent],
+    quality_agent: Optional[QualityAgent],
+    critique_agent: CritiqueAgent,
+    combined_agent: Optional[CombinedAnalysisAgent] = None,
+):
+    """Create the LangGraph review workflow for the given agents.
+
+    The workflow runs three specialized agents in parallel, then runs the
+    critique agent to deduplicate and improve findings, and finally combines
+    their findings into a formatted GitHub comment. When a combined agent is
+    given, diffs under COMBINED_DIFF_THRESHOLD characters are analyzed by it
+    in a single LLM call instead. The graph itself is compiled once and
+    cached; the agents are passed to its nodes through the run config of a
+    copy of that graph.
+
+    Args:
+        logic_agent: Agent for detecting logic errors
+        security_agent: Agent for identifying security vulnerabilities
+        quality_agent: Agent for reviewing code quality
+        critique_agent: Agent for deduplication and confidence scoring
+        combined_agent: Optional agent covering all three categories for small diffs
+
+    Returns:
+        Compiled LangGraph graph configured with the agents, ready for invocation
+    """
+    return _compile_review_graph().with_config(
+        configurable={
+            "logic_agent": logic_agent,
+            "security_agent": security_agent,
+            "quality_agent": quality_agent,
+            "critique_agent": critique_agent,
+            "combined_agent": combined_agent,
+        }
+    )
+
+
 class ReviewSupervisor:
     """Supervisor that orchestrates parallel execution of code review agents.
 
@@ -159,6 +330,8 @@ class ReviewSupervisor:
         security_agent: Agent for identifying security vulnerabilities
         quality_agent: Agent for reviewing code quality
         critique_agent: Agent for deduplication and confidence scoring
+        combined_agent: Agent used instead of the three above for small diffs,
+            or None when combined analysis is disabled
         graph: Compiled LangGraph workflow
     """
 
@@ -168,6 +341,8 @@ class ReviewSupervisor:
         security_agent: Optional[SecurityAgent] = None,
         quality_agent: Optional[QualityAgent] = None,
         critique_agent: Optional[CritiqueAgent] = None,
+        combined_agent: Optional[CombinedAnalysisAgent] = None,
+        enable_combined: bool = False,
     ):
         """Initialize the ReviewSupervisor.
 
@@ -176,6 +351,12 @@ class ReviewSupervisor:
             security_agent: Optional SecurityAgent. If not provided, creates a new instance.
             quality_agent: Optional QualityAgent. If not provided, creates a new instance.
             critique_agent: Optional CritiqueAgent. If not provided, creates a new instance.
+            combined_agent: Optional CombinedAnalysisAgent. Passing one enables
+                combined analysis; if not provided and enable_combined is set,
+                creates a new instance.
+            enable_combined: Whether small diffs are analyzed by a default
+                combined agent in one LLM call instead of by the three agents
+                separately.
 
         All default agents share a single LLMService instance for efficiency.
         """
@@ -193,6 +374,12 @@ class ReviewSupervisor:
         self.critique_agent = (
             critique_agent if critique_agent is not None else CritiqueAgent(llm_service=shared_llm)
         )
+        if combined_agent is not None:
+            self.combined_agent = combined_agent
+        elif enable_combined:
+            self.combined_agent = CombinedAnalysisAgent(llm_service=shared_llm)
+        else:
+            self.combined_agent = None
 
         # Create the graph using the agents
         self.graph = create_review_graph(
@@ -200,6 +387,7 @@ class ReviewSupervisor:
             self.security_agent,
             self.quality_agent,
             self.critique_agent,
+            self.combined_agent,
         )
 
     def run(
@@ -235,3 +423,34 @@ class ReviewSupervisor:
         # Invoke the graph and return the final state
         final_state = self.graph.invoke(initial_state)
         return final_state
+
+    async def arun(
+        self,
+        pr_diff: str,
+        pr_files: List[str],
+        pr_file_contents: Optional[dict] = None,
+    ) -> ReviewState:
+        """Run the code review workflow asynchronously.
+
+        Same workflow as run, but awaits the agents' LLM calls so the three
+        parallel agents overlap on the event loop instead of holding threads.
+
+        Args:
+            pr_diff: The code diff to analyze
+            pr_files: List of file paths changed in the PR
+            pr_file_contents: Optional mapping of file paths to full content
+
+        Returns:
+            ReviewState with all findings and the final formatted comment
+        """
+        initial_state: ReviewState = {
+            "pr_diff": pr_diff,
+            "pr_files": pr_files,
+            "pr_file_contents": pr_file_contents,
+            "logic_findings": [],
+            "security_findings": [],
+            "quality_findings": [],
+            "final_comment": "",
+        }
+
+        return await self.graph.ainvoke(initial_state)
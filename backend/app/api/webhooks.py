@@ -1,8 +1,10 @@
 # backend/app/api/webhooks.py
 """GitHub webhook handling."""
 
+import functools
 import hashlib
 import hmac
+import re
 from typing import Annotated, Optional
 
 from fastapi import APIRouter, BackgroundTasks, Depends, Header, HTTPException, Request
@@ -18,6 +20,9 @@ from app.worker import process_review
 # Router
 router = APIRouter(prefix="/api/webhook", tags=["webhooks"])
 
+# GitHub sends HMAC-SHA256 signatures as exactly 64 lower-case hex digits
+_SIGNATURE_HEX_RE = re.compile(r"[0-9a-f]{64}")
+
 
 class GitHubUser(BaseModel):
     """GitHub user in webhook payload."""
@@ -63,6 +68,23 @@ class WebhookPayload(BaseModel):
     sender: Optional[GitHubUser] = None
 
 
+@functools.lru_cache(maxsize=4)
+def _keyed_hmac(secret: bytes) -> "hmac.HMAC":
+    """Get the HMAC-SHA256 object keyed with a secret.
+
+    Keying an HMAC hashes the inner and outer key pads. Doing that once per
+    secret and copying the result per request skips that work on every
+    webhook. The cache is small because secrets rarely rotate.
+
+    Args:
+        secret: Webhook secret bytes
+
+    Returns:
+        HMAC object keyed with the secret; callers must copy() it before use
+    """
+    return hmac.new(secret, digestmod=hashlib.sha256)
+
+
 def verify_signature(payload: bytes, signature: str, secret: str) -> bool:
     """Verify GitHub webhook signature.
 
@@ -77,13 +99,17 @@ def verify_signature(payload: bytes, signature: str, secret: str) -> bool:
     if not signature.startswith("sha256="):
         return False
 
-    expected_signature = "sha256=" + hmac.new(
-        secret.encode("utf-8"),
-        payload,
-        hashlib.sha256,
-    ).hexdigest()
+    # bytes.fromhex tolerates whitespace and upper case, so check the exact
+    # format first; then compare raw digests instead of hex strings
+    signature_hex = signature[7:]
+    if not _SIGNATURE_HEX_RE.fullmatch(signature_hex):
+        return False
+    signature_bytes = bytes.fromhex(signature_hex)
+
+    mac = _keyed_hmac(secret.encode("utf-8")).copy()
+    mac.update(payload)
 
-    return hmac.compare_digest(signature, expected_signature)
+    return hmac.compare_digest(mac.digest(), signature_bytes)
 
 
 # Dependency injection
@@ -1,5 +1,6 @@
 """LLM service for AI code review operations."""
 
+import asyncio
 import json
 import re
 from typing import Optional, Type, TypeVar
@@ -88,6 +89,18 @@ class LLMService:
         response = self.llm.invoke(prompt)
         return response.content
 
+    async def ainvoke(self, prompt: str) -> str:
+        """Async variant of invoke that awaits the model without blocking.
+
+        Args:
+            prompt: The prompt to send to the model.
+
+        Returns:
+            The model's response content as a string.
+        """
+        response = await self.llm.ainvoke(prompt)
+        return response.content
+
     def invoke_structured(self, prompt: str, output_schema: Type[T], max_retries: int = 2) -> T:
         """Send prompt and return structured Pydantic model response.
 
@@ -102,76 +115,134 @@ class LLMService:
         Returns:
             An instance of the output_schema Pydantic model.
         """
-        # Generate JSON schema from the Pydantic model
-        schema = output_schema.model_json_schema()
-
-        # Append JSON format instructions to the prompt
-        json_prompt = f"""{prompt}
-
-IMPORTANT: You MUST respond with valid JSON that matches this schema:
-{json.dumps(schema, indent=2)}
-
-Respond ONLY with the JSON object, no markdown code blocks, no explanations."""
+        json_prompt = self._build_json_prompt(prompt, output_schema)
 
         last_error = None
         for attempt in range(max_retries + 1):
             try:
-                # Get response
                 response = self.llm.invoke(json_prompt)
-                content = response.content
-
-                # Handle case where content is a list (some Gemini responses)
-                if isinstance(content, list):
-                    # Join list elements if they're strings, or convert to JSON
-                    if all(isinstance(item, str) for item in content):
-                        content = "".join(content)
-                    else:
-                        # Content is structured data, convert to JSON string
-                        content = json.dumps(content)
-
-                # Handle empty or None response
-                if not content or (isinstance(content, str) and not content.strip()):
-                    raise ValueError("LLM returned empty response")
+                return self._parse_structured(response.content, output_schema)
 
-                # Extract JSON from response (handle possible markdown code blocks)
-                json_match = re.search(r"```(?:json)?\s*([\s\S]*?)```", content)
-                if json_match:
-                    content = json_match.group(1).strip()
+            except (json.JSONDecodeError, ValueError) as e:
+                last_error = e
+                if attempt < max_retries:
+                    import time
+                    time.sleep(1)  # Brief delay before retry
+                    continue
+                raise
 
-                # Fix common JSON escape issues from LLM responses
-                # LLMs sometimes produce invalid escape sequences like \s, \d, \w in regex patterns
-                content = self._fix_json_escapes(content)
+        # This shouldn't be reached, but just in case
+        raise last_error if last_error else ValueError("Failed to get structured response")
 
-                # Strip any leading/trailing whitespace
-                content = content.strip()
+    async def ainvoke_structured(
+        self, prompt: str, output_schema: Type[T], max_retries: int = 2
+    ) -> T:
+        """Async variant of invoke_structured.
 
-                # Handle empty content after processing
-                if not content:
-                    raise ValueError("LLM returned empty JSON content")
+        Awaits the model call so several agents can wait on the LLM
+        concurrently on one event loop.
 
-                # Parse and validate with Pydantic
-                data = json.loads(content)
+        Args:
+            prompt: The prompt to send to the model.
+            output_schema: Pydantic model class to parse response into.
+            max_retries: Maximum number of retries on failure.
 
-                # Handle case where LLM returns a list instead of the expected object
-                # This happens when it returns findings directly instead of AgentResponse
-                if isinstance(data, list) and hasattr(output_schema, 'model_fields'):
-                    # Check if the schema expects a 'findings' field
-                    if 'findings' in output_schema.model_fields:
-                        data = {"findings": data, "summary": "Analysis complete."}
+        Returns:
+            An instance of the output_schema Pydantic model.
+        """
+        json_prompt = self._build_json_prompt(prompt, output_schema)
 
-                return output_schema.model_validate(data)
+        last_error = None
+        for attempt in range(max_retries + 1):
+            try:
+                response = await self.llm.ainvoke(json_prompt)
+                return self._parse_structured(response.content, output_schema)
 
             except (json.JSONDecodeError, ValueError) as e:
                 last_error = e
                 if attempt < max_retries:
-                    import time
-                    time.sleep(1)  # Brief delay before retry
+                    await asyncio.sleep(1)  # Brief delay before retry
                     continue
                 raise
 
-        # This shouldn't be reached, but just in case
         raise last_error if last_error else ValueError("Failed to get structured response")
 
+    def _build_json_prompt(self, prompt: str, output_schema: Type[T]) -> str:
+        """Append JSON-mode instructions and the output schema to a prompt.
+
+        Args:
+            prompt: The prompt to send to the model.
+            output_schema: Pydantic model class the response must match.
+
+        Returns:
+            The prompt with JSON format instructions appended.
+        """
+        # Generate JSON schema from the Pydantic model
+        schema = output_schema.model_json_schema()
+
+        # Append JSON format instructions to the prompt
+        return f"""{prompt}
+
+IMPORTANT: You MUST respond with valid JSON that matches this schema:
+{json.dumps(schema, indent=2)}
+
+Respond ONLY with the JSON object, no markdown code blocks, no explanations."""
+
+    def _parse_structured(self, content, output_schema: Type[T]) -> T:
+        """Parse raw model output into the output schema.
+
+        Args:
+            content: Response content from the model (string or list of parts).
+            output_schema: Pydantic model class to parse response into.
+
+        Returns:
+            An instance of the output_schema Pydantic model.
+
+        Raises:
+            ValueError: If the content is empty or fails validation.
+            json.JSONDecodeError: If the content is not valid JSON.
+        """
+        # Handle case where content is a list (some Gemini responses)
+        if isinstance(content, list):
+            # Join list elements if they're strings, or convert to JSON
+            if all(isinstance(item, str) for item in content):
+                content = "".join(content)
+            else:
+                # Content is structured data, convert to JSON string
+                content = json.dumps(content)
+
+        # Handle empty or None response
+        if not content or (isinstance(content, str) and not content.strip()):
+            raise ValueError("LLM returned empty response")
+
+        # Extract JSON from response (handle possible markdown code blocks)
+        json_match = re.search(r"```(?:json)?\s*([\s\S]*?)```", content)
+        if json_match:
+            content = json_match.group(1).strip()
+
+        # Fix common JSON escape issues from LLM responses
+        # LLMs sometimes produce invalid escape sequences like \s, \d, \w in regex patterns
+        content = self._fix_json_escapes(content)
+
+        # Strip any leading/trailing whitespace
+        content = content.strip()
+
+        # Handle empty content after processing
+        if not content:
+            raise ValueError("LLM returned empty JSON content")
+
+        # Parse and validate with Pydantic
+        data = json.loads(content)
+
+        # Handle case where LLM returns a list instead of the expected object
+        # This happens when it returns findings directly instead of AgentResponse
+        if isinstance(data, list) and hasattr(output_schema, 'model_fields'):
+            # Check if the schema expects a 'findings' field
+            if 'findings' in output_schema.model_fields:
+                data = {"findings": data, "summary": "Analysis complete."}
+
+        return output_schema.model_validate(data)
+
 
 def get_llm_service() -> LLMService:
     """Dependency injection helper for LLMService.
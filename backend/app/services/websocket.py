@@ -1,8 +1,10 @@
 """WebSocket connection manager for real-time progress updates."""
 
 import asyncio
-from typing import Dict, List
+import json
+from typing import Any, Dict, Set
 
+import anyio
 from fastapi import WebSocket
 
 
@@ -15,7 +17,7 @@ class ConnectionManager:
 
     def __init__(self):
         """Initialize empty connection store."""
-        self.active_connections: Dict[str, List[WebSocket]] = {}
+        self.active_connections: Dict[str, Set[WebSocket]] = {}
         self._lock = asyncio.Lock()
 
     async def connect(self, review_id: str, websocket: WebSocket) -> None:
@@ -27,9 +29,7 @@ class ConnectionManager:
         """
         await websocket.accept()
         async with self._lock:
-            if review_id not in self.active_connections:
-                self.active_connections[review_id] = []
-            self.active_connections[review_id].append(websocket)
+            self.active_connections.setdefault(review_id, set()).add(websocket)
 
     def disconnect(self, review_id: str, websocket: WebSocket) -> None:
         """Remove a WebSocket connection.
@@ -38,28 +38,43 @@ class ConnectionManager:
             review_id: The review ID this connection was watching
             websocket: The WebSocket connection to remove
         """
-        if review_id in self.active_connections:
-            if websocket in self.active_connections[review_id]:
-                self.active_connections[review_id].remove(websocket)
-            if not self.active_connections[review_id]:
+        connections = self.active_connections.get(review_id)
+        if connections is not None:
+            connections.discard(websocket)
+            if not connections:
                 del self.active_connections[review_id]
 
-    async def broadcast(self, review_id: str, data: dict) -> None:
+    async def broadcast(self, review_id: str, data: Dict[str, Any]) -> None:
         """Send data to all connections watching a review.
 
+        The payload is serialized once and sent as the same text frame to
+        every client, rather than re-encoded per connection by send_json.
+
         Args:
             review_id: The review ID to broadcast to
             data: JSON-serializable data to send
         """
-        if review_id not in self.active_connections:
+        # Snapshot so connects/disconnects during the sends don't affect this pass
+        connections = list(self.active_connections.get(review_id, ()))
+        if not connections:
             return
 
-        disconnected = []
-        for websocket in self.active_connections[review_id]:
+        # Same encoding Starlette's send_json uses, so clients see identical frames
+        payload = json.dumps(data, separators=(",", ":"), ensure_ascii=False)
+
+        disconnected: Set[WebSocket] = set()
+
+        async def _safe_send(websocket: WebSocket) -> None:
             try:
-                await websocket.send_json(data)
+                await websocket.send_text(payload)
             except Exception:
-                disconnected.append(websocket)
+                disconnected.add(websocket)
+
+        # Send to every client concurrently; the task group returns once all
+        # sends have finished, and a failed send doesn't stop the others
+        async with anyio.create_task_group() as tg:
+            for websocket in connections:
+                tg.start_soon(_safe_send, websocket)
 
         # Clean up disconnected clients
         for ws in disconnected:
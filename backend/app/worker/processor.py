@@ -3,7 +3,7 @@
 import logging
 import re
 import time
-from typing import Dict, List, Any, Optional
+from typing import Dict, List, Any, Mapping, Optional
 from uuid import UUID
 
 from app.agents.schemas import AgentFinding
@@ -155,7 +155,7 @@ SEVERITY_RANK = {
 }
 
 
-def process_review(job_data: Dict[str, Any]) -> None:
+def process_review(job_data: Mapping[str, Any]) -> None:
     """Process a PR review job in the background.
 
     This function runs as a FastAPI BackgroundTask and handles:
@@ -168,7 +168,7 @@ def process_review(job_data: Dict[str, Any]) -> None:
     7. Updating the review status
 
     Args:
-        job_data: Dictionary containing:
+        job_data: Mapping containing:
             - review_id: UUID of the review record
             - owner: GitHub repository owner
             - repo: GitHub repository name
@@ -1,7 +1,62 @@
 """Pytest fixtures for CodeGuard AI tests."""
 
+import asyncio
+import sys
+from types import MappingProxyType, SimpleNamespace
+
 import pytest
-from unittest.mock import MagicMock
+from unittest.mock import DEFAULT, MagicMock, patch
+
+# uvicorn[standard] runs the app on uvloop wherever it is available
+if sys.platform != "win32":
+    try:
+        import uvloop
+    except ImportError:
+        uvloop = None
+else:
+    uvloop = None
+
+# Names in app.worker.processor that process_review's tests replace with mocks
+_WORKER_COLLABORATORS = (
+    "SettingsRepo",
+    "RateLimiter",
+    "get_redis_client",
+    "GitHubService",
+    "ReviewSupervisor",
+    "FindingRepo",
+    "ReviewRepo",
+    "get_db",
+)
+
+# Default supervisor result for worker tests: no findings
+_EMPTY_REVIEW_RESULT = MappingProxyType({
+    "logic_findings": [],
+    "security_findings": [],
+    "quality_findings": [],
+    "final_comment": "Comment",
+})
+
+
+@pytest.fixture(scope="session")
+def event_loop_policy():
+    """Run async tests on the same event loop implementation as production."""
+    if uvloop is None:
+        return asyncio.DefaultEventLoopPolicy()
+    return uvloop.EventLoopPolicy()
+
+
+@pytest.fixture(scope="session")
+def asgi_client():
+    """TestClient over the app shared by the whole session.
+
+    Used outside a ``with`` block, so the app's lifespan never runs. Tests
+    that override dependencies must remove only the overrides they set.
+    """
+    from fastapi.testclient import TestClient
+
+    from app.main import app
+
+    return TestClient(app, base_url="http://test")
 
 
 @pytest.fixture
@@ -38,3 +93,84 @@ def mock_review_supervisor():
         "final_comment": "## CodeGuard AI Review\n\nNo issues found!",
     }
     return supervisor
+
+
+@pytest.fixture(scope="module")
+def worker_patches():
+    """Patch process_review's collaborators once for a whole test module.
+
+    Yields the patch.multiple dict keyed by patched name. The mocks are
+    shared by every test in the module, so use them through a fixture that
+    resets them per test.
+    """
+    from app.worker import processor
+
+    with patch.multiple(
+        processor, **dict.fromkeys(_WORKER_COLLABORATORS, DEFAULT)
+    ) as mocks:
+        yield mocks
+
+
+@pytest.fixture
+def worker_mocks(worker_patches):
+    """Reset the module's worker patches and wire them for a clean run.
+
+    Returns the patch.multiple dict keyed by patched name; tests override
+    only what they exercise, e.g. the supervisor's run.side_effect.
+    """
+    from app.agents.supervisor import ReviewSupervisor
+    from app.db.repositories import FindingRepo, ReviewRepo, SettingsRepo
+    from app.services.github import GitHubService
+    from app.services.queue import RateLimiter
+
+    mocks = worker_patches
+    for mock in mocks.values():
+        mock.reset_mock(return_value=True, side_effect=True)
+
+    # Fresh instances per test, specced so a misspelled or removed method fails
+    for name, cls in (
+        ("SettingsRepo", SettingsRepo),
+        ("RateLimiter", RateLimiter),
+        ("GitHubService", GitHubService),
+        ("ReviewSupervisor", ReviewSupervisor),
+        ("FindingRepo", FindingRepo),
+        ("ReviewRepo", ReviewRepo),
+    ):
+        mocks[name].return_value = MagicMock(spec=cls)
+
+    # get_by_id must return a review object with repository_id for settings lookup
+    mocks["ReviewRepo"].return_value.get_by_id.return_value.repository_id = "repo-uuid"
+    # Settings: no settings → defaults (all agents enabled)
+    mocks["SettingsRepo"].return_value.get_by_repository.return_value = None
+
+    mock_github = mocks["GitHubService"].return_value
+    mock_github.get_pr_diff.return_value = "diff --git a/app.py b/app.py\n+code"
+    mock_github.post_comment.return_value = {"id": 12345}
+
+    mocks["ReviewSupervisor"].return_value.run.return_value = _EMPTY_REVIEW_RESULT
+    mocks["RateLimiter"].return_value.can_proceed.return_value = True
+    return mocks
+
+
+@pytest.fixture
+def supervisor_mocks(monkeypatch):
+    """Patch ReviewSupervisor's default agents with mocks that find nothing.
+
+    Exposes the patched agent classes by name plus ``response``, the critique
+    result, which passes through empty findings unless a test overrides it.
+    """
+    # Default agents share one LLMService built in ReviewSupervisor.__init__
+    monkeypatch.setattr("app.services.llm.LLMService", MagicMock())
+
+    mocks = SimpleNamespace()
+    for name in ("LogicAgent", "SecurityAgent", "QualityAgent", "CritiqueAgent"):
+        cls_mock = MagicMock()
+        monkeypatch.setattr(f"app.agents.supervisor.{name}", cls_mock)
+        setattr(mocks, name, cls_mock)
+
+    for name in ("LogicAgent", "SecurityAgent", "QualityAgent"):
+        getattr(mocks, name).return_value.analyze.return_value = []
+
+    mocks.response = MagicMock(logic_findings=[], security_findings=[], quality_findings=[])
+    mocks.CritiqueAgent.return_value.critique.return_value = mocks.response
+    return mocks
@@ -1,6 +1,6 @@
 """Tests for BaseAgent class."""
 
-from unittest.mock import MagicMock, patch
+from unittest.mock import AsyncMock, MagicMock, patch
 
 import pytest
 
@@ -137,3 +137,25 @@ class TestBaseAgent:
         assert result[0].severity == "critical"
         assert result[0].title == "SQL Injection"
         mock_llm.invoke_structured.assert_called_once()
+
+    @pytest.mark.asyncio
+    async def test_analyze_async_awaits_llm(self):
+        """Test that analyze_async formats the prompt and awaits the LLM."""
+        mock_llm = MagicMock()
+        mock_llm.ainvoke_structured = AsyncMock(
+            return_value=AgentResponse(findings=[], summary="No issues found")
+        )
+
+        agent = BaseAgent(
+            agent_type=AgentType.LOGIC,
+            prompt_template="Review: {diff}\nFiles: {files}",
+            llm_service=mock_llm,
+        )
+
+        result = await agent.analyze_async(diff="+ new code", files=["a.py"])
+
+        assert result == []
+        mock_llm.ainvoke_structured.assert_awaited_once_with(
+            "Review: + new code\nFiles: a.py", AgentResponse
+        )
+        mock_llm.invoke_structured.assert_not_called()
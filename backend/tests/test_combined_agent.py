@@ -0,0 +1,44 @@
+"""Tests for Combined Analysis Agent."""
+
+from unittest.mock import MagicMock, patch
+
+from app.agents.combined_agent import CombinedAnalysisAgent
+from app.agents.prompts import COMBINED_AGENT_PROMPT
+from app.agents.schemas import AgentFinding, CombinedResponse
+
+
+class TestCombinedAnalysisAgent:
+    """Tests for CombinedAnalysisAgent class."""
+
+    def test_combined_agent_initializes(self):
+        """Test CombinedAnalysisAgent uses the combined prompt by default."""
+        with patch("app.agents.combined_agent.LLMService"):
+            agent = CombinedAnalysisAgent()
+
+        assert agent.prompt_template == COMBINED_AGENT_PROMPT
+
+    def test_combined_agent_splits_response(self):
+        """Test that one LLM response is mapped to the three finding lists."""
+        finding = AgentFinding(
+            severity="critical",
+            file_path="app.py",
+            line_number=3,
+            title="SQL Injection",
+            description="User input concatenated into query",
+        )
+        llm = MagicMock()
+        llm.invoke_structured.return_value = CombinedResponse(
+            security_findings=[finding], summary="Found 1 issue"
+        )
+
+        findings = CombinedAnalysisAgent(llm_service=llm).analyze("+ small", ["app.py"])
+
+        llm.invoke_structured.assert_called_once()
+        prompt, schema = llm.invoke_structured.call_args[0]
+        assert "+ small" in prompt
+        assert schema is CombinedResponse
+        assert findings == {
+            "logic_findings": [],
+            "security_findings": [finding],
+            "quality_findings": [],
+        }
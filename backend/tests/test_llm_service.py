@@ -1,7 +1,7 @@
 """Tests for LLM service."""
 
 import pytest
-from unittest.mock import MagicMock, patch
+from unittest.mock import AsyncMock, MagicMock, patch
 
 from pydantic import BaseModel
 
@@ -71,6 +71,31 @@ class TestLLMService:
         assert result.issue_count == 2
         assert result.summary == "Found issues"
 
+    @pytest.mark.asyncio
+    @patch("app.services.llm.ChatGoogleGenerativeAI")
+    async def test_ainvoke_structured_returns_pydantic_model(self, mock_chat_class):
+        """Test ainvoke_structured awaits the model and parses the response."""
+
+        class CodeReviewResult(BaseModel):
+            has_issues: bool
+            summary: str
+
+        mock_llm = MagicMock()
+        mock_response = MagicMock()
+        mock_response.content = '{"has_issues": false, "summary": "Clean"}'
+        mock_llm.ainvoke = AsyncMock(return_value=mock_response)
+        mock_chat_class.return_value = mock_llm
+
+        service = LLMService(api_key="test-api-key", model="gemini-2.5-flash")
+        result = await service.ainvoke_structured(
+            "Analyze this code", output_schema=CodeReviewResult
+        )
+
+        assert result.has_issues is False
+        assert result.summary == "Clean"
+        mock_llm.ainvoke.assert_awaited_once()
+        mock_llm.invoke.assert_not_called()
+
     @patch("app.services.llm.ChatGoogleGenerativeAI")
     def test_invoke_structured_handles_markdown_code_blocks(self, mock_chat_class):
         """Test invoke_structured handles JSON wrapped in markdown code blocks."""
@@ -1,97 +1,71 @@
 """Tests for Redis queue service."""
 
+import json
+
 import pytest
 from unittest.mock import MagicMock
 from uuid import uuid4
 
 from app.services.queue import QueueService, RateLimiter
 
+_JOB_ID = str(uuid4())
 
-class TestRateLimiter:
-    """Tests for rate limiter."""
 
-    def test_can_proceed_under_limit(self):
-        """Test that requests under limit are allowed."""
-        mock_redis = MagicMock()
-        mock_redis.get.return_value = None
-        mock_redis.incr.return_value = 1
+def _decoded_set_payload(mock_redis):
+    """Decode the JSON value passed to the most recent redis.set call."""
+    return json.loads(mock_redis.set.call_args[0][1])
 
-        limiter = RateLimiter(mock_redis, max_requests=15, window_seconds=60)
-        result = limiter.can_proceed("gemini")
 
-        assert result is True
+@pytest.fixture
+def limiter_factory():
+    """Build a RateLimiter(15 requests / 60s) over a mock Redis client."""
 
-    def test_cannot_proceed_at_limit(self):
-        """Test that requests at limit are blocked."""
+    def _make(get_val=None, incr_val=None):
         mock_redis = MagicMock()
-        mock_redis.get.return_value = "15"
+        mock_redis.get.return_value = get_val
+        if incr_val is not None:
+            mock_redis.incr.return_value = incr_val
+        return RateLimiter(mock_redis, max_requests=15, window_seconds=60), mock_redis
 
-        limiter = RateLimiter(mock_redis, max_requests=15, window_seconds=60)
-        result = limiter.can_proceed("gemini")
+    return _make
 
-        assert result is False
 
-    def test_increment_first_request(self):
-        """Test incrementing counter on first request sets expiry."""
-        mock_redis = MagicMock()
-        mock_redis.incr.return_value = 1
+class TestRateLimiter:
+    """Tests for rate limiter."""
 
-        limiter = RateLimiter(mock_redis, max_requests=15, window_seconds=60)
-        result = limiter.increment("gemini")
+    def test_can_proceed_under_limit(self, limiter_factory):
+        """Test that requests under limit are allowed."""
+        limiter, _ = limiter_factory(get_val=None, incr_val=1)
+        assert limiter.can_proceed("gemini") is True
+
+    def test_cannot_proceed_at_limit(self, limiter_factory):
+        """Test that requests at limit are blocked."""
+        limiter, _ = limiter_factory(get_val="15")
+        assert limiter.can_proceed("gemini") is False
 
-        assert result == 1
+    def test_increment_first_request(self, limiter_factory):
+        """Test incrementing counter on first request sets expiry."""
+        limiter, mock_redis = limiter_factory(incr_val=1)
+
+        assert limiter.increment("gemini") == 1
         mock_redis.expire.assert_called_once_with("rate_limit:gemini", 60)
 
-    def test_increment_subsequent_request(self):
+    def test_increment_subsequent_request(self, limiter_factory):
         """Test incrementing counter on subsequent request does not set expiry."""
-        mock_redis = MagicMock()
-        mock_redis.incr.return_value = 5
-
-        limiter = RateLimiter(mock_redis, max_requests=15, window_seconds=60)
-        result = limiter.increment("gemini")
+        limiter, mock_redis = limiter_factory(incr_val=5)
 
-        assert result == 5
+        assert limiter.increment("gemini") == 5
         mock_redis.expire.assert_not_called()
 
-    def test_get_remaining_no_requests(self):
-        """Test getting remaining when no requests made."""
-        mock_redis = MagicMock()
-        mock_redis.get.return_value = None
-
-        limiter = RateLimiter(mock_redis, max_requests=15, window_seconds=60)
-        result = limiter.get_remaining("gemini")
-
-        assert result == 15
-
-    def test_get_remaining_some_requests(self):
-        """Test getting remaining when some requests made."""
-        mock_redis = MagicMock()
-        mock_redis.get.return_value = "10"
-
-        limiter = RateLimiter(mock_redis, max_requests=15, window_seconds=60)
-        result = limiter.get_remaining("gemini")
-
-        assert result == 5
-
-    def test_get_remaining_at_limit(self):
-        """Test getting remaining when at limit."""
-        mock_redis = MagicMock()
-        mock_redis.get.return_value = "15"
-
-        limiter = RateLimiter(mock_redis, max_requests=15, window_seconds=60)
-        result = limiter.get_remaining("gemini")
-
-        assert result == 0
-
-    def test_get_remaining_over_limit(self):
-        """Test getting remaining when somehow over limit returns 0."""
-        mock_redis = MagicMock()
-        mock_redis.get.return_value = "20"
-
-        limiter = RateLimiter(mock_redis, max_requests=15, window_seconds=60)
-        result = limiter.get_remaining("gemini")
-
-        assert result == 0
+    @pytest.mark.parametrize(
+        "get_value,expected",
+        [(None, 15), ("10", 5), ("15", 0), ("20", 0)],
+        ids=["no_requests", "some_requests", "at_limit", "over_limit"],
+    )
+    def test_get_remaining(self, limiter_factory, get_value, expected):
+        """Test remaining requests in the window, never below 0."""
+        limiter, _ = limiter_factory(get_val=get_value)
+        assert limiter.get_remaining("gemini") == expected
 
 
 class TestQueueService:
@@ -103,8 +77,7 @@ class TestQueueService:
         mock_redis.lpush.return_value = 1
 
         queue = QueueService(mock_redis)
-        job_id = str(uuid4())
-        queue.enqueue_review(job_id, {"pr_number": 1})
+        queue.enqueue_review(_JOB_ID, {"pr_number": 1})
 
         mock_redis.lpush.assert_called_once()
 
@@ -149,6 +122,7 @@ class TestQueueService:
         queue.set_job_status("job-123", "processing")
 
         mock_redis.set.assert_called_once()
+        assert _decoded_set_payload(mock_redis)["status"] == "processing"
         mock_redis.expire.assert_called_once_with("codeguard:job:job-123", 3600)
 
     def test_set_job_status_with_result(self):
@@ -163,9 +137,7 @@ class TestQueueService:
         )
 
         # Verify set was called with result included
-        call_args = mock_redis.set.call_args
-        import json
-        status_data = json.loads(call_args[0][1])
+        status_data = _decoded_set_payload(mock_redis)
         assert status_data["status"] == "completed"
         assert status_data["result"]["findings"] == 3
 
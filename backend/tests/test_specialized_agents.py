@@ -1,6 +1,6 @@
 """Tests for specialized agent classes (LogicAgent, SecurityAgent, QualityAgent)."""
 
-from unittest.mock import MagicMock, patch
+from unittest.mock import Mock, patch
 
 import pytest
 
@@ -12,143 +12,133 @@ from app.agents.prompts import (
 )
 from app.agents.schemas import AgentFinding, AgentResponse
 from app.models import AgentType
+from app.services.llm import LLMService
+
+# (agent class, prompt template, agent type, agent name, focus keyword)
+AGENT_CASES = [
+    pytest.param(
+        LogicAgent, LOGIC_AGENT_PROMPT, AgentType.LOGIC, "Logic Agent", "logic errors",
+        id="logic",
+    ),
+    pytest.param(
+        SecurityAgent, SECURITY_AGENT_PROMPT, AgentType.SECURITY, "Security Agent",
+        "security vulnerabilities",
+        id="security",
+    ),
+    pytest.param(
+        QualityAgent, QUALITY_AGENT_PROMPT, AgentType.QUALITY, "Quality Agent", "code quality",
+        id="quality",
+    ),
+]
+
+# LLM responses are built once at import and shared across the analyze tests.
+# Inputs are known-good, so skip validation; test_shared_findings_are_valid covers it.
+_LOGIC_FINDING = AgentFinding.model_construct(
+    severity="warning",
+    file_path="test.py",
+    line_number=10,
+    title="Null check missing",
+    description="Missing None check before method call",
+    suggestion="Add if obj is not None check",
+)
+_LOGIC_RESPONSE = AgentResponse(findings=[_LOGIC_FINDING], summary="Found 1 logic issue")
+
+_SECURITY_FINDING = AgentFinding.model_construct(
+    severity="critical",
+    file_path="app.py",
+    line_number=25,
+    title="SQL Injection",
+    description="User input directly concatenated into SQL query",
+    suggestion="Use parameterized queries",
+)
+_SECURITY_RESPONSE = AgentResponse(
+    findings=[_SECURITY_FINDING], summary="Found 1 security vulnerability"
+)
 
-
-class TestLogicAgent:
-    """Tests for LogicAgent."""
-
-    @patch("app.agents.base.LLMService")
-    def test_has_correct_agent_type(self, mock_llm_class):
-        """Test that LogicAgent has AgentType.LOGIC."""
-        agent = LogicAgent()
-        assert agent.agent_type == AgentType.LOGIC
-
-    @patch("app.agents.base.LLMService")
-    def test_uses_correct_prompt(self, mock_llm_class):
-        """Test that LogicAgent uses LOGIC_AGENT_PROMPT."""
-        agent = LogicAgent()
-        assert agent.prompt_template == LOGIC_AGENT_PROMPT
-        assert "Logic Agent" in agent.prompt_template
-        assert "logic errors" in agent.prompt_template.lower()
-
-    @patch("app.agents.base.LLMService")
-    def test_analyze_returns_findings(self, mock_llm_class):
-        """Test that LogicAgent.analyze returns findings from LLM."""
-        mock_llm = MagicMock()
-        findings = [
-            AgentFinding(
-                severity="warning",
-                file_path="test.py",
-                line_number=10,
-                title="Null check missing",
-                description="Missing None check before method call",
-                suggestion="Add if obj is not None check",
-            ),
-        ]
-        mock_response = AgentResponse(findings=findings, summary="Found 1 logic issue")
-        mock_llm.invoke_structured.return_value = mock_response
-        mock_llm_class.return_value = mock_llm
-
-        agent = LogicAgent()
-        result = agent.analyze(diff="+ obj.method()", files=["test.py"])
-
-        assert result == findings
-        assert len(result) == 1
-        assert result[0].title == "Null check missing"
-        mock_llm.invoke_structured.assert_called_once()
-
-
-class TestSecurityAgent:
-    """Tests for SecurityAgent."""
-
-    @patch("app.agents.base.LLMService")
-    def test_has_correct_agent_type(self, mock_llm_class):
-        """Test that SecurityAgent has AgentType.SECURITY."""
-        agent = SecurityAgent()
-        assert agent.agent_type == AgentType.SECURITY
-
-    @patch("app.agents.base.LLMService")
-    def test_uses_correct_prompt(self, mock_llm_class):
-        """Test that SecurityAgent uses SECURITY_AGENT_PROMPT."""
-        agent = SecurityAgent()
-        assert agent.prompt_template == SECURITY_AGENT_PROMPT
-        assert "Security Agent" in agent.prompt_template
-        assert "security vulnerabilities" in agent.prompt_template.lower()
-
-    @patch("app.agents.base.LLMService")
-    def test_analyze_returns_findings(self, mock_llm_class):
-        """Test that SecurityAgent.analyze returns findings from LLM."""
-        mock_llm = MagicMock()
-        findings = [
-            AgentFinding(
-                severity="critical",
-                file_path="app.py",
-                line_number=25,
-                title="SQL Injection",
-                description="User input directly concatenated into SQL query",
-                suggestion="Use parameterized queries",
-            ),
-        ]
-        mock_response = AgentResponse(findings=findings, summary="Found 1 security vulnerability")
-        mock_llm.invoke_structured.return_value = mock_response
-        mock_llm_class.return_value = mock_llm
-
-        agent = SecurityAgent()
-        result = agent.analyze(
-            diff="+ query = f\"SELECT * FROM users WHERE id = {user_id}\"",
-            files=["app.py"],
-        )
-
-        assert result == findings
-        assert len(result) == 1
-        assert result[0].severity == "critical"
-        assert result[0].title == "SQL Injection"
-        mock_llm.invoke_structured.assert_called_once()
-
-
-class TestQualityAgent:
-    """Tests for QualityAgent."""
-
-    @patch("app.agents.base.LLMService")
-    def test_has_correct_agent_type(self, mock_llm_class):
-        """Test that QualityAgent has AgentType.QUALITY."""
-        agent = QualityAgent()
-        assert agent.agent_type == AgentType.QUALITY
-
-    @patch("app.agents.base.LLMService")
-    def test_uses_correct_prompt(self, mock_llm_class):
-        """Test that QualityAgent uses QUALITY_AGENT_PROMPT."""
-        agent = QualityAgent()
-        assert agent.prompt_template == QUALITY_AGENT_PROMPT
-        assert "Quality Agent" in agent.prompt_template
-        assert "code quality" in agent.prompt_template.lower()
-
-    @patch("app.agents.base.LLMService")
-    def test_analyze_returns_findings(self, mock_llm_class):
-        """Test that QualityAgent.analyze returns findings from LLM."""
-        mock_llm = MagicMock()
-        findings = [
-            AgentFinding(
-                severity="warning",
-                file_path="utils.py",
-                line_number=15,
-                title="Missing docstring",
-                description="Public function lacks docstring",
-                suggestion="Add docstring describing function purpose and parameters",
-            ),
-        ]
-        mock_response = AgentResponse(findings=findings, summary="Found 1 quality issue")
-        mock_llm.invoke_structured.return_value = mock_response
-        mock_llm_class.return_value = mock_llm
-
-        agent = QualityAgent()
-        result = agent.analyze(
-            diff="+ def process_data(items):\n+     return [x * 2 for x in items]",
-            files=["utils.py"],
-        )
-
-        assert result == findings
-        assert len(result) == 1
-        assert result[0].severity == "warning"
-        assert result[0].title == "Missing docstring"
-        mock_llm.invoke_structured.assert_called_once()
+_QUALITY_FINDING = AgentFinding.model_construct(
+    severity="warning",
+    file_path="utils.py",
+    line_number=15,
+    title="Missing docstring",
+    description="Public function lacks docstring",
+    suggestion="Add docstring describing function purpose and parameters",
+)
+_QUALITY_RESPONSE = AgentResponse(findings=[_QUALITY_FINDING], summary="Found 1 quality issue")
+
+# (agent class, diff, LLM response)
+ANALYZE_CASES = [
+    pytest.param(LogicAgent, "+ obj.method()", _LOGIC_RESPONSE, id="logic"),
+    pytest.param(
+        SecurityAgent,
+        "+ query = f\"SELECT * FROM users WHERE id = {user_id}\"",
+        _SECURITY_RESPONSE,
+        id="security",
+    ),
+    pytest.param(
+        QualityAgent,
+        "+ def process_data(items):\n+     return [x * 2 for x in items]",
+        _QUALITY_RESPONSE,
+        id="quality",
+    ),
+]
+
+
+@pytest.fixture(scope="module")
+def patched_llm():
+    """Patch LLMService once for every agent test in this module."""
+    with patch("app.agents.base.LLMService") as mock_cls:
+        yield mock_cls
+
+
+@pytest.fixture
+def mock_llm_class(patched_llm):
+    """Module-wide LLMService mock, reset so tests don't see each other's calls."""
+    patched_llm.reset_mock(return_value=True, side_effect=True)
+    return patched_llm
+
+
+@pytest.fixture
+def agent(request, patched_llm):
+    """Agent instance built from the indirectly parametrized agent class."""
+    return request.param()
+
+
+@pytest.mark.parametrize("agent,prompt,atype,name,keyword", AGENT_CASES, indirect=["agent"])
+def test_agent_type(agent, prompt, atype, name, keyword):
+    """Test that each agent has the correct AgentType."""
+    assert agent.agent_type == atype
+
+
+@pytest.mark.parametrize("agent,prompt,atype,name,keyword", AGENT_CASES, indirect=["agent"])
+def test_agent_prompt(agent, prompt, atype, name, keyword):
+    """Test that each agent uses its own prompt template."""
+    assert agent.prompt_template == prompt
+    assert name in agent.prompt_template
+    assert keyword in agent.prompt_template.lower()
+
+
+@pytest.mark.parametrize("cls,diff,response", ANALYZE_CASES)
+def test_agent_analyze(mock_llm_class, cls, diff, response):
+    """Test that analyze returns findings from the LLM."""
+    mock_llm = Mock(spec=LLMService)
+    mock_llm.invoke_structured.return_value = response
+    mock_llm_class.return_value = mock_llm
+    expected = response.findings[0]
+
+    agent = cls()
+    result = agent.analyze(diff=diff, files=[expected.file_path])
+
+    assert result == response.findings
+    assert len(result) == 1
+    assert result[0].severity == expected.severity
+    assert result[0].title == expected.title
+    mock_llm.invoke_structured.assert_called_once()
+
+
+@pytest.mark.parametrize(
+    "finding", [_LOGIC_FINDING, _SECURITY_FINDING, _QUALITY_FINDING],
+    ids=["logic", "security", "quality"],
+)
+def test_shared_findings_are_valid(finding):
+    """Test that the unvalidated shared findings pass AgentFinding validation."""
+    assert AgentFinding.model_validate(finding.model_dump()) == finding
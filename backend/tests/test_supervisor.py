@@ -1,16 +1,37 @@
 """Tests for ReviewSupervisor and create_review_graph."""
 
-from unittest.mock import MagicMock, patch
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock, patch
 
 import pytest
+from langgraph.graph import START
 
 from app.agents.critique import CritiqueAgent
 from app.agents.formatter import CommentFormatter
 from app.agents.logic_agent import LogicAgent
 from app.agents.quality_agent import QualityAgent
-from app.agents.schemas import AgentFinding, CritiqueResponse, ReviewState
+from app.agents.schemas import (
+    AgentFinding,
+    CritiqueResponse,
+    ReviewState,
+)
 from app.agents.security_agent import SecurityAgent
-from app.agents.supervisor import ReviewSupervisor, create_review_graph
+from app.agents.supervisor import (
+    COMBINED_DIFF_THRESHOLD,
+    ReviewSupervisor,
+    _compile_review_graph,
+    create_review_graph,
+)
+
+
+def _stub_agent(retval=()):
+    """Lightweight agent stub whose analyze returns a fresh list of retval."""
+    return SimpleNamespace(analyze=MagicMock(return_value=list(retval)))
+
+
+def _stub_critique(resp):
+    """Lightweight critique agent stub whose critique returns resp."""
+    return SimpleNamespace(critique=MagicMock(return_value=resp))
 
 
 class TestCreateReviewGraph:
@@ -18,10 +39,10 @@ class TestCreateReviewGraph:
 
     def test_create_review_graph_returns_compiled_graph(self):
         """Test that create_review_graph returns a compiled LangGraph."""
-        mock_logic = MagicMock(spec=LogicAgent)
-        mock_security = MagicMock(spec=SecurityAgent)
-        mock_quality = MagicMock(spec=QualityAgent)
-        mock_critique = MagicMock(spec=CritiqueAgent)
+        mock_logic = _stub_agent()
+        mock_security = _stub_agent()
+        mock_quality = _stub_agent()
+        mock_critique = _stub_critique(CritiqueResponse())
 
         graph = create_review_graph(mock_logic, mock_security, mock_quality, mock_critique)
 
@@ -29,50 +50,53 @@ class TestCreateReviewGraph:
         assert hasattr(graph, "invoke")
         assert callable(graph.invoke)
 
+    def test_create_review_graph_reuses_compiled_graph(self):
+        """Test that graphs for different agents share one compiled topology."""
+        compiled = _compile_review_graph()
+        hits = _compile_review_graph.cache_info().hits
+
+        create_review_graph(
+            MagicMock(spec=LogicAgent),
+            MagicMock(spec=SecurityAgent),
+            MagicMock(spec=QualityAgent),
+            MagicMock(spec=CritiqueAgent),
+        )
+        create_review_graph(None, None, None, MagicMock(spec=CritiqueAgent))
+
+        assert _compile_review_graph.cache_info().hits == hits + 2
+        assert _compile_review_graph() is compiled
+
+    def test_review_graph_runs_agents_in_parallel(self):
+        """Test that the three agents fan out from START and fan in at critique."""
+        graph = create_review_graph(None, None, None, MagicMock(spec=CritiqueAgent))
+        edges = {(edge.source, edge.target) for edge in graph.get_graph().edges}
+
+        for agent in ("logic", "security", "quality"):
+            assert (START, agent) in edges
+            assert (agent, "critique") in edges
+        assert ("logic", "security") not in edges
+        assert ("security", "quality") not in edges
+
 
 class TestReviewSupervisor:
     """Tests for ReviewSupervisor class."""
 
-    @patch("app.agents.supervisor.LogicAgent")
-    @patch("app.agents.supervisor.SecurityAgent")
-    @patch("app.agents.supervisor.QualityAgent")
-    @patch("app.agents.supervisor.CritiqueAgent")
-    def test_init_creates_graph(
-        self, mock_critique_class, mock_quality_class, mock_security_class, mock_logic_class
-    ):
+    def test_init_creates_graph(self, supervisor_mocks):
         """Test that ReviewSupervisor initializes with a compiled graph."""
         supervisor = ReviewSupervisor()
 
         # Check that agents were created
-        mock_logic_class.assert_called_once()
-        mock_security_class.assert_called_once()
-        mock_quality_class.assert_called_once()
-        mock_critique_class.assert_called_once()
+        supervisor_mocks.LogicAgent.assert_called_once()
+        supervisor_mocks.SecurityAgent.assert_called_once()
+        supervisor_mocks.QualityAgent.assert_called_once()
+        supervisor_mocks.CritiqueAgent.assert_called_once()
 
         # Check that graph was created
         assert supervisor.graph is not None
         assert hasattr(supervisor.graph, "invoke")
 
-    @patch("app.agents.supervisor.LogicAgent")
-    @patch("app.agents.supervisor.SecurityAgent")
-    @patch("app.agents.supervisor.QualityAgent")
-    @patch("app.agents.supervisor.CritiqueAgent")
-    def test_run_returns_review_state(
-        self, mock_critique_class, mock_quality_class, mock_security_class, mock_logic_class
-    ):
+    def test_run_returns_review_state(self, supervisor_mocks):
         """Test that run returns a ReviewState dictionary."""
-        # Setup mock agents to return empty findings
-        mock_logic_class.return_value.analyze.return_value = []
-        mock_security_class.return_value.analyze.return_value = []
-        mock_quality_class.return_value.analyze.return_value = []
-
-        # Setup critique agent to return empty findings
-        mock_critique_response = MagicMock()
-        mock_critique_response.logic_findings = []
-        mock_critique_response.security_findings = []
-        mock_critique_response.quality_findings = []
-        mock_critique_class.return_value.critique.return_value = mock_critique_response
-
         supervisor = ReviewSupervisor()
         result = supervisor.run(pr_diff="+ test code", pr_files=["test.py"])
 
@@ -84,50 +108,37 @@ class TestReviewSupervisor:
         assert "quality_findings" in result
         assert "final_comment" in result
 
-    @patch("app.agents.supervisor.LogicAgent")
-    @patch("app.agents.supervisor.SecurityAgent")
-    @patch("app.agents.supervisor.QualityAgent")
-    @patch("app.agents.supervisor.CritiqueAgent")
-    def test_run_calls_all_agents(
-        self, mock_critique_class, mock_quality_class, mock_security_class, mock_logic_class
-    ):
+    def test_run_calls_all_agents(self, supervisor_mocks):
         """Test that run invokes analyze on all three agents."""
-        mock_logic = MagicMock()
-        mock_security = MagicMock()
-        mock_quality = MagicMock()
-        mock_critique = MagicMock()
-
-        mock_logic.analyze.return_value = []
-        mock_security.analyze.return_value = []
-        mock_quality.analyze.return_value = []
-
-        mock_critique_response = MagicMock()
-        mock_critique_response.logic_findings = []
-        mock_critique_response.security_findings = []
-        mock_critique_response.quality_findings = []
-        mock_critique.critique.return_value = mock_critique_response
-
-        mock_logic_class.return_value = mock_logic
-        mock_security_class.return_value = mock_security
-        mock_quality_class.return_value = mock_quality
-        mock_critique_class.return_value = mock_critique
-
         supervisor = ReviewSupervisor()
         supervisor.run(pr_diff="+ test code", pr_files=["test.py"])
 
-        # Verify all agents were called
-        mock_logic.analyze.assert_called_once_with("+ test code", ["test.py"])
-        mock_security.analyze.assert_called_once_with("+ test code", ["test.py"])
-        mock_quality.analyze.assert_called_once_with("+ test code", ["test.py"])
-        mock_critique.critique.assert_called_once()
+        # Verify all agents were called (no file contents were passed)
+        for name in ("LogicAgent", "SecurityAgent", "QualityAgent"):
+            agent = getattr(supervisor_mocks, name).return_value
+            agent.analyze.assert_called_once_with("+ test code", ["test.py"], None)
+        # Nothing was found, so there is nothing to critique
+        supervisor_mocks.CritiqueAgent.return_value.critique.assert_not_called()
+
+    def test_run_critiques_when_findings_exist(self, supervisor_mocks):
+        """Test that run invokes the critique agent once any agent finds something."""
+        finding = AgentFinding(
+            severity="info",
+            file_path="test.py",
+            title="Magic number",
+            description="Hardcoded value should be a constant",
+        )
+        supervisor_mocks.QualityAgent.return_value.analyze.return_value = [finding]
+        supervisor_mocks.response.quality_findings = [finding]
+
+        result = ReviewSupervisor().run(pr_diff="+ x = 42", pr_files=["test.py"])
+
+        supervisor_mocks.CritiqueAgent.return_value.critique.assert_called_once_with(
+            logic_findings=[], security_findings=[], quality_findings=[finding]
+        )
+        assert result["quality_findings"] == [finding]
 
-    @patch("app.agents.supervisor.LogicAgent")
-    @patch("app.agents.supervisor.SecurityAgent")
-    @patch("app.agents.supervisor.QualityAgent")
-    @patch("app.agents.supervisor.CritiqueAgent")
-    def test_run_collects_findings_from_all_agents(
-        self, mock_critique_class, mock_quality_class, mock_security_class, mock_logic_class
-    ):
+    def test_run_collects_findings_from_all_agents(self, supervisor_mocks):
         """Test that run collects and returns findings from all agents."""
         # Create mock findings for each agent
         logic_finding = AgentFinding(
@@ -152,16 +163,14 @@ class TestReviewSupervisor:
             description="Function lacks documentation",
         )
 
-        mock_logic_class.return_value.analyze.return_value = [logic_finding]
-        mock_security_class.return_value.analyze.return_value = [security_finding]
-        mock_quality_class.return_value.analyze.return_value = [quality_finding]
+        supervisor_mocks.LogicAgent.return_value.analyze.return_value = [logic_finding]
+        supervisor_mocks.SecurityAgent.return_value.analyze.return_value = [security_finding]
+        supervisor_mocks.QualityAgent.return_value.analyze.return_value = [quality_finding]
 
         # Critique agent passes through findings
-        mock_critique_response = MagicMock()
-        mock_critique_response.logic_findings = [logic_finding]
-        mock_critique_response.security_findings = [security_finding]
-        mock_critique_response.quality_findings = [quality_finding]
-        mock_critique_class.return_value.critique.return_value = mock_critique_response
+        supervisor_mocks.response.logic_findings = [logic_finding]
+        supervisor_mocks.response.security_findings = [security_finding]
+        supervisor_mocks.response.quality_findings = [quality_finding]
 
         supervisor = ReviewSupervisor()
         result = supervisor.run(pr_diff="+ test code", pr_files=["test.py"])
@@ -176,13 +185,7 @@ class TestReviewSupervisor:
         assert len(result["quality_findings"]) == 1
         assert result["quality_findings"][0].title == "Missing Docstring"
 
-    @patch("app.agents.supervisor.LogicAgent")
-    @patch("app.agents.supervisor.SecurityAgent")
-    @patch("app.agents.supervisor.QualityAgent")
-    @patch("app.agents.supervisor.CritiqueAgent")
-    def test_run_generates_formatted_comment(
-        self, mock_critique_class, mock_quality_class, mock_security_class, mock_logic_class
-    ):
+    def test_run_generates_formatted_comment(self, supervisor_mocks):
         """Test that run generates a formatted GitHub comment."""
         # Create mock findings
         logic_finding = AgentFinding(
@@ -193,16 +196,10 @@ class TestReviewSupervisor:
             description="Missing null check",
         )
 
-        mock_logic_class.return_value.analyze.return_value = [logic_finding]
-        mock_security_class.return_value.analyze.return_value = []
-        mock_quality_class.return_value.analyze.return_value = []
+        supervisor_mocks.LogicAgent.return_value.analyze.return_value = [logic_finding]
 
         # Critique agent passes through findings
-        mock_critique_response = MagicMock()
-        mock_critique_response.logic_findings = [logic_finding]
-        mock_critique_response.security_findings = []
-        mock_critique_response.quality_findings = []
-        mock_critique_class.return_value.critique.return_value = mock_critique_response
+        supervisor_mocks.response.logic_findings = [logic_finding]
 
         supervisor = ReviewSupervisor()
         result = supervisor.run(pr_diff="+ test code", pr_files=["test.py"])
@@ -214,13 +211,6 @@ class TestReviewSupervisor:
 
     def test_run_with_custom_agents(self):
         """Test that ReviewSupervisor works with injected agents."""
-        # Create mock agents
-        mock_logic = MagicMock(spec=LogicAgent)
-        mock_security = MagicMock(spec=SecurityAgent)
-        mock_quality = MagicMock(spec=QualityAgent)
-        mock_critique = MagicMock(spec=CritiqueAgent)
-
-        # Setup mock return values
         logic_finding = AgentFinding(
             severity="warning",
             file_path="custom.py",
@@ -228,16 +218,12 @@ class TestReviewSupervisor:
             title="Custom Logic Issue",
             description="Found by custom agent",
         )
-        mock_logic.analyze.return_value = [logic_finding]
-        mock_security.analyze.return_value = []
-        mock_quality.analyze.return_value = []
 
-        # Critique agent passes through findings
-        mock_critique_response = MagicMock()
-        mock_critique_response.logic_findings = [logic_finding]
-        mock_critique_response.security_findings = []
-        mock_critique_response.quality_findings = []
-        mock_critique.critique.return_value = mock_critique_response
+        # Create stub agents; the critique agent passes through findings
+        mock_logic = _stub_agent([logic_finding])
+        mock_security = _stub_agent()
+        mock_quality = _stub_agent()
+        mock_critique = _stub_critique(CritiqueResponse(logic_findings=[logic_finding]))
 
         # Create supervisor with custom agents
         supervisor = ReviewSupervisor(
@@ -264,41 +250,185 @@ class TestReviewSupervisor:
         assert len(result["logic_findings"]) == 1
         assert result["logic_findings"][0].title == "Custom Logic Issue"
 
+    @pytest.mark.asyncio
+    async def test_arun_awaits_async_agents(self):
+        """Test that arun drives the agents through their async methods."""
+        logic_finding = AgentFinding(
+            severity="warning",
+            file_path="custom.py",
+            line_number=1,
+            title="Async Logic Issue",
+            description="Found by async agent",
+        )
+        mock_logic = MagicMock(spec=LogicAgent)
+        mock_security = MagicMock(spec=SecurityAgent)
+        mock_quality = MagicMock(spec=QualityAgent)
+        mock_critique = MagicMock(spec=CritiqueAgent)
+        mock_logic.analyze_async = AsyncMock(return_value=[logic_finding])
+        mock_security.analyze_async = AsyncMock(return_value=[])
+        mock_quality.analyze_async = AsyncMock(return_value=[])
+        mock_critique.critique_async = AsyncMock(
+            return_value=CritiqueResponse(logic_findings=[logic_finding])
+        )
+
+        supervisor = ReviewSupervisor(
+            logic_agent=mock_logic,
+            security_agent=mock_security,
+            quality_agent=mock_quality,
+            critique_agent=mock_critique,
+        )
+        result = await supervisor.arun(pr_diff="+ custom code", pr_files=["custom.py"])
+
+        mock_logic.analyze_async.assert_awaited_once_with("+ custom code", ["custom.py"], None)
+        mock_security.analyze_async.assert_awaited_once()
+        mock_quality.analyze_async.assert_awaited_once()
+        mock_critique.critique_async.assert_awaited_once()
+        mock_logic.analyze.assert_not_called()
+        assert result["logic_findings"] == [logic_finding]
+        assert "Async Logic Issue" in result["final_comment"]
+
 
 class TestCritiqueIntegration:
     """Tests for Critique Agent integration in supervisor."""
 
-    def test_supervisor_runs_critique_agent(self):
+    def test_supervisor_runs_critique_agent(self, supervisor_mocks):
         """Test that supervisor runs critique agent after other agents."""
-        mock_finding = MagicMock()
-        mock_finding.severity = "warning"
-        mock_finding.confidence = "high"
-        mock_finding.file_path = "test.py"
-        mock_finding.line_number = 1
-        mock_finding.title = "Test"
-        mock_finding.description = "Test"
-        mock_finding.suggestion = None
-
-        with patch("app.agents.supervisor.LogicAgent") as MockLogic, \
-             patch("app.agents.supervisor.SecurityAgent") as MockSecurity, \
-             patch("app.agents.supervisor.QualityAgent") as MockQuality, \
-             patch("app.agents.supervisor.CritiqueAgent") as MockCritique:
-
-            # Setup mocks
-            MockLogic.return_value.analyze.return_value = [mock_finding]
-            MockSecurity.return_value.analyze.return_value = []
-            MockQuality.return_value.analyze.return_value = []
-
-            mock_critique_response = MagicMock()
-            mock_critique_response.logic_findings = [mock_finding]
-            mock_critique_response.security_findings = []
-            mock_critique_response.quality_findings = []
-            mock_critique_response.duplicates_removed = 0
-            mock_critique_response.misattributions_fixed = 0
-            MockCritique.return_value.critique.return_value = mock_critique_response
-
-            supervisor = ReviewSupervisor()
-            result = supervisor.run("diff content", ["test.py"])
-
-            # Verify critique was called
-            MockCritique.return_value.critique.assert_called_once()
+        finding = AgentFinding(
+            severity="warning",
+            confidence="high",
+            file_path="test.py",
+            line_number=1,
+            title="Test",
+            description="Test",
+        )
+        supervisor_mocks.LogicAgent.return_value.analyze.return_value = [finding]
+        supervisor_mocks.response.logic_findings = [finding]
+
+        result = ReviewSupervisor().run("diff content", ["test.py"])
+
+        supervisor_mocks.CritiqueAgent.return_value.critique.assert_called_once()
+        assert result["logic_findings"] == [finding]
+
+
+class TestCombinedAnalysis:
+    """Tests for routing small diffs to the CombinedAnalysisAgent."""
+
+    _FINDING = AgentFinding(
+        severity="critical",
+        file_path="app.py",
+        line_number=3,
+        title="SQL Injection",
+        description="User input concatenated into query",
+    )
+
+    def _supervisor(self, combined_agent):
+        """Build a supervisor whose critique agent passes findings through."""
+        critique = SimpleNamespace(critique=MagicMock(side_effect=CritiqueResponse))
+        with patch("app.services.llm.LLMService"):
+            return ReviewSupervisor(
+                logic_agent=_stub_agent(),
+                security_agent=_stub_agent(),
+                quality_agent=_stub_agent(),
+                critique_agent=critique,
+                combined_agent=combined_agent,
+            )
+
+    def _combined_agent(self):
+        """Combined agent stub that reports a single security finding."""
+        return SimpleNamespace(
+            analyze=MagicMock(
+                return_value={
+                    "logic_findings": [],
+                    "security_findings": [self._FINDING],
+                    "quality_findings": [],
+                }
+            )
+        )
+
+    def _initial_state(self) -> ReviewState:
+        """Initial review state for a small diff."""
+        return {
+            "pr_diff": "+ small",
+            "pr_files": ["app.py"],
+            "pr_file_contents": None,
+            "logic_findings": [],
+            "security_findings": [],
+            "quality_findings": [],
+            "final_comment": "",
+        }
+
+    def test_combined_disabled_by_default(self, supervisor_mocks):
+        """Test that ReviewSupervisor fans out unless combined analysis is enabled."""
+        supervisor = ReviewSupervisor()
+
+        assert supervisor.combined_agent is None
+        supervisor.run(pr_diff="+ small", pr_files=["test.py"])
+        supervisor_mocks.LogicAgent.return_value.analyze.assert_called_once()
+
+    def test_enable_combined_creates_default_agent(self, supervisor_mocks, monkeypatch):
+        """Test that enable_combined builds a combined agent when none is passed."""
+        combined_cls = MagicMock()
+        monkeypatch.setattr("app.agents.supervisor.CombinedAnalysisAgent", combined_cls)
+
+        supervisor = ReviewSupervisor(enable_combined=True)
+
+        combined_cls.assert_called_once()
+        assert supervisor.combined_agent is combined_cls.return_value
+
+    def test_small_diff_uses_combined_agent(self):
+        """Test that a diff under the threshold is analyzed in one combined call."""
+        # Passing a combined agent enables combined analysis without the flag
+        combined = self._combined_agent()
+        supervisor = self._supervisor(combined)
+
+        result = supervisor.run(pr_diff="+ small", pr_files=["app.py"])
+
+        combined.analyze.assert_called_once_with("+ small", ["app.py"], None)
+        supervisor.logic_agent.analyze.assert_not_called()
+        supervisor.security_agent.analyze.assert_not_called()
+        supervisor.quality_agent.analyze.assert_not_called()
+        supervisor.critique_agent.critique.assert_called_once()
+        assert result["security_findings"] == [self._FINDING]
+        assert "SQL Injection" in result["final_comment"]
+
+    def test_large_diff_fans_out(self):
+        """Test that a diff at the threshold still runs the three agents."""
+        combined = self._combined_agent()
+        supervisor = self._supervisor(combined)
+        diff = "+" * COMBINED_DIFF_THRESHOLD
+
+        supervisor.run(pr_diff=diff, pr_files=["app.py"])
+
+        combined.analyze.assert_not_called()
+        supervisor.logic_agent.analyze.assert_called_once_with(diff, ["app.py"], None)
+        supervisor.security_agent.analyze.assert_called_once()
+        supervisor.quality_agent.analyze.assert_called_once()
+
+    def test_all_agents_disabled_skips_combined_agent(self):
+        """Test that a small diff makes no LLM call when every agent is disabled."""
+        combined = self._combined_agent()
+        graph = create_review_graph(
+            None,
+            None,
+            None,
+            SimpleNamespace(critique=MagicMock(side_effect=CritiqueResponse)),
+            combined,
+        )
+
+        result = graph.invoke(self._initial_state())
+
+        combined.analyze.assert_not_called()
+        assert result["security_findings"] == []
+
+    def test_combined_skips_disabled_categories(self):
+        """Test that combined findings are dropped for a disabled agent."""
+        graph = create_review_graph(
+            _stub_agent(),
+            None,
+            _stub_agent(),
+            SimpleNamespace(critique=MagicMock(side_effect=CritiqueResponse)),
+            self._combined_agent(),
+        )
+        result = graph.invoke(self._initial_state())
+
+        assert result["security_findings"] == []
@@ -6,8 +6,6 @@ import hmac
 import pytest
 from unittest.mock import MagicMock, patch
 
-from fastapi.testclient import TestClient
-
 from app.api.webhooks import (
     verify_signature,
     WebhookPayload,
@@ -44,6 +42,45 @@ class TestSignatureVerification:
         result = verify_signature(payload, signature, secret)
         assert result is False
 
+    def test_verify_wrong_digest(self):
+        """Test that well-formed hex for a different payload fails verification."""
+        secret = "test-secret"
+        signature = "sha256=" + hmac.new(
+            secret.encode(), b'{"action": "closed"}', hashlib.sha256
+        ).hexdigest()
+
+        result = verify_signature(b'{"action": "opened"}', signature, secret)
+        assert result is False
+
+    @pytest.mark.parametrize(
+        "mangle",
+        [
+            pytest.param(lambda h: " ".join(h[i:i + 2] for i in range(0, len(h), 2)), id="spaced"),
+            pytest.param(str.upper, id="upper-case"),
+            pytest.param(lambda h: h + "\n", id="trailing-newline"),
+        ],
+    )
+    def test_verify_rejects_non_canonical_hex(self, mangle):
+        """Test that a correct digest in a non-canonical hex form fails verification."""
+        secret = "test-secret"
+        payload = b'{"action": "opened"}'
+        digest = hmac.new(secret.encode(), payload, hashlib.sha256).hexdigest()
+
+        result = verify_signature(payload, "sha256=" + mangle(digest), secret)
+        assert result is False
+
+    def test_verify_reuses_keyed_hmac_per_secret(self):
+        """Test that repeated verification with one secret stays correct."""
+        secret = "test-secret"
+        payloads = [b'{"action": "opened"}', b'{"action": "synchronize"}']
+
+        for payload in payloads * 2:
+            signature = "sha256=" + hmac.new(
+                secret.encode(), payload, hashlib.sha256
+            ).hexdigest()
+            assert verify_signature(payload, signature, secret) is True
+            assert verify_signature(payload, signature, "other-secret") is False
+
     def test_verify_missing_prefix(self):
         """Test that signature without sha256= prefix fails."""
         secret = "test-secret"
@@ -98,28 +135,40 @@ class TestWebhookPayload:
         assert payload.action == "synchronize"
         assert payload.pull_request.head.sha == "def456"
 
+    def test_parse_json_directly(self):
+        """Test parsing raw body bytes the way the webhook endpoint does."""
+        body = (
+            b'{"action": "opened", "number": 7,'
+            b' "pull_request": {"title": "Fix bug", "head": {"sha": "abc123"}},'
+            b' "repository": {"id": 123456, "full_name": "owner/repo"}}'
+        )
 
-class TestWebhookEndpoint:
-    """Tests for webhook endpoint."""
+        payload = WebhookPayload.model_validate_json(body)
+
+        assert payload.action == "opened"
+        assert payload.number == 7
+        assert payload.pull_request.head.sha == "abc123"
+        assert payload.repository.full_name == "owner/repo"
 
-    def setup_method(self):
-        """Set up test client with mocked dependencies."""
-        # Mock dependencies to avoid needing real DB/Redis
-        self.mock_repo_repo = MagicMock()
-        self.mock_review_repo = MagicMock()
 
-        app.dependency_overrides[get_repository_repo] = lambda: self.mock_repo_repo
-        app.dependency_overrides[get_review_repo] = lambda: self.mock_review_repo
+@pytest.fixture
+def mock_deps():
+    """Override the webhook's repository dependencies for one test."""
+    mock_repo_repo = MagicMock()
+    mock_review_repo = MagicMock()
+    app.dependency_overrides[get_repository_repo] = lambda: mock_repo_repo
+    app.dependency_overrides[get_review_repo] = lambda: mock_review_repo
+    yield mock_repo_repo, mock_review_repo
+    app.dependency_overrides.pop(get_repository_repo, None)
+    app.dependency_overrides.pop(get_review_repo, None)
 
-        self.client = TestClient(app)
 
-    def teardown_method(self):
-        """Clean up dependency overrides."""
-        app.dependency_overrides.clear()
+class TestWebhookEndpoint:
+    """Tests for webhook endpoint."""
 
-    def test_webhook_ignored_non_pr_event(self):
+    def test_webhook_ignored_non_pr_event(self, asgi_client, mock_deps):
         """Test that non-PR events are ignored."""
-        response = self.client.post(
+        response = asgi_client.post(
             "/api/webhook/github",
             content=b'{"action": "created"}',
             headers={
@@ -132,10 +181,10 @@ class TestWebhookEndpoint:
         assert response.json()["status"] == "ignored"
 
     @patch("app.api.webhooks.settings")
-    def test_webhook_invalid_signature(self, mock_settings):
+    def test_webhook_invalid_signature(self, mock_settings, asgi_client, mock_deps):
         """Test that invalid signature returns 401."""
         mock_settings.github_webhook_secret = "test-secret"
-        response = self.client.post(
+        response = asgi_client.post(
             "/api/webhook/github",
             content=b'{"action": "opened"}',
             headers={
@@ -1,9 +1,11 @@
 """Tests for the background worker processor."""
 
 import pytest
-from unittest.mock import MagicMock, patch, call
+from types import MappingProxyType
+from unittest.mock import Mock, patch
 from uuid import UUID
 
+from app.worker import processor
 from app.worker.processor import (
     process_review,
     map_agent_severity,
@@ -13,61 +15,27 @@ from app.worker.processor import (
 )
 from app.models.finding import AgentType, Severity
 from app.models.review import ReviewStatus
+from app.agents import base
+from app.agents.prompts import (
+    PYTHON_LOGIC_PROMPT,
+    PYTHON_QUALITY_PROMPT,
+    PYTHON_SECURITY_PROMPT,
+)
 from app.agents.schemas import AgentFinding
 
+_REVIEW_ID_STR = "550e8400-e29b-41d4-a716-446655440000"
+_REVIEW_UUID = UUID(_REVIEW_ID_STR)
 
-class TestMapAgentSeverity:
-    """Tests for severity mapping function."""
-
-    def test_map_critical(self):
-        """Critical maps to CRITICAL."""
-        assert map_agent_severity("critical") == Severity.CRITICAL
-
-    def test_map_warning(self):
-        """Warning maps to MEDIUM."""
-        assert map_agent_severity("warning") == Severity.MEDIUM
-
-    def test_map_info(self):
-        """Info maps to INFO."""
-        assert map_agent_severity("info") == Severity.INFO
-
-    def test_map_unknown_defaults_to_info(self):
-        """Unknown severity defaults to INFO."""
-        assert map_agent_severity("unknown") == Severity.INFO
-
-
-class TestMapAgentType:
-    """Tests for agent type mapping function."""
-
-    def test_map_logic(self):
-        """Logic maps to LOGIC."""
-        assert map_agent_type("logic") == AgentType.LOGIC
-
-    def test_map_security(self):
-        """Security maps to SECURITY."""
-        assert map_agent_type("security") == AgentType.SECURITY
-
-    def test_map_quality(self):
-        """Quality maps to QUALITY."""
-        assert map_agent_type("quality") == AgentType.QUALITY
-
-    def test_map_unknown_defaults_to_logic(self):
-        """Unknown agent type defaults to LOGIC."""
-        assert map_agent_type("unknown") == AgentType.LOGIC
-
-
-class TestExtractFilesFromDiff:
-    """Tests for diff parsing function."""
-
-    def test_extract_single_file(self):
-        """Extract single file from diff."""
-        diff = "diff --git a/app.py b/app.py\n--- a/app.py\n+++ b/app.py"
-        files = extract_files_from_diff(diff)
-        assert files == ["app.py"]
+# Read-only so no test can leak changes into another; copy with {**_JOB_DATA, ...}
+_JOB_DATA = MappingProxyType({
+    "review_id": _REVIEW_ID_STR,
+    "owner": "testuser",
+    "repo": "testrepo",
+    "pr_number": 1,
+    "commit_sha": "abc123",
+})
 
-    def test_extract_multiple_files(self):
-        """Extract multiple files from diff."""
-        diff = """diff --git a/app.py b/app.py
+_MULTI_FILE_DIFF = """diff --git a/app.py b/app.py
 --- a/app.py
 +++ b/app.py
 @@ -1,3 +1,4 @@
@@ -78,18 +46,71 @@ diff --git a/utils/helper.py b/utils/helper.py
 @@ -10,5 +10,6 @@
 +def new_func():
 """
-        files = extract_files_from_diff(diff)
-        assert files == ["app.py", "utils/helper.py"]
 
-    def test_extract_empty_diff(self):
-        """Empty diff returns empty list."""
-        files = extract_files_from_diff("")
-        assert files == []
+# Test findings are known-good, so build them without pydantic validation
+_BASE_FINDING = {"severity": "info", "file_path": "x.py", "title": "t", "description": "d"}
 
-    def test_extract_no_files(self):
-        """Non-diff text returns empty list."""
-        files = extract_files_from_diff("Some random text\nwithout diff markers")
-        assert files == []
+
+def _af(**overrides) -> AgentFinding:
+    """Build an unvalidated AgentFinding from defaults plus overrides."""
+    return AgentFinding.model_construct(**{**_BASE_FINDING, **overrides})
+
+
+# Supervisor result, built once and shared read-only by the process_review tests
+_ONE_FINDING_RESULT = MappingProxyType({
+    "logic_findings": [],
+    "security_findings": [
+        _af(severity="critical", file_path="app.py", title="Issue", description="Desc")
+    ],
+    "quality_findings": [],
+    "final_comment": "## Review Comment",
+})
+
+
+@pytest.mark.parametrize(
+    "raw,expected",
+    [
+        ("critical", Severity.CRITICAL),
+        ("warning", Severity.MEDIUM),
+        ("info", Severity.INFO),
+        pytest.param("unknown", Severity.INFO, id="unknown-defaults-to-info"),
+    ],
+)
+def test_map_agent_severity(raw, expected):
+    """Test that agent severities map to database severities."""
+    assert map_agent_severity(raw) == expected
+
+
+@pytest.mark.parametrize(
+    "raw,expected",
+    [
+        ("logic", AgentType.LOGIC),
+        ("security", AgentType.SECURITY),
+        ("quality", AgentType.QUALITY),
+        pytest.param("unknown", AgentType.LOGIC, id="unknown-defaults-to-logic"),
+    ],
+)
+def test_map_agent_type(raw, expected):
+    """Test that agent type names map to AgentType values."""
+    assert map_agent_type(raw) == expected
+
+
+@pytest.mark.parametrize(
+    "diff,expected",
+    [
+        pytest.param(
+            "diff --git a/app.py b/app.py\n--- a/app.py\n+++ b/app.py",
+            ["app.py"],
+            id="single-file",
+        ),
+        pytest.param(_MULTI_FILE_DIFF, ["app.py", "utils/helper.py"], id="multiple-files"),
+        pytest.param("", [], id="empty-diff"),
+        pytest.param("Some random text\nwithout diff markers", [], id="no-files"),
+    ],
+)
+def test_extract_files_from_diff(diff, expected):
+    """Test that changed file paths are extracted from a unified diff."""
+    assert extract_files_from_diff(diff) == expected
 
 
 class TestMapFinding:
@@ -97,7 +118,7 @@ class TestMapFinding:
 
     def test_map_finding_all_fields(self):
         """Map finding with all fields."""
-        agent_finding = AgentFinding(
+        agent_finding = _af(
             severity="critical",
             file_path="app.py",
             line_number=42,
@@ -106,9 +127,9 @@ class TestMapFinding:
             suggestion="Use parameterized queries",
         )
 
-        result = _map_finding(agent_finding, "550e8400-e29b-41d4-a716-446655440000", "security")
+        result = _map_finding(agent_finding, _REVIEW_ID_STR, "security")
 
-        assert result.review_id == UUID("550e8400-e29b-41d4-a716-446655440000")
+        assert result.review_id == _REVIEW_UUID
         assert result.agent_type == AgentType.SECURITY
         assert result.severity == Severity.CRITICAL
         assert result.file_path == "app.py"
@@ -119,14 +140,9 @@ class TestMapFinding:
 
     def test_map_finding_optional_fields(self):
         """Map finding with optional fields as None."""
-        agent_finding = AgentFinding(
-            severity="info",
-            file_path="test.py",
-            title="Minor issue",
-            description="Description",
-        )
+        agent_finding = _af(file_path="test.py", title="Minor issue", description="Description")
 
-        result = _map_finding(agent_finding, "550e8400-e29b-41d4-a716-446655440000", "quality")
+        result = _map_finding(agent_finding, _REVIEW_ID_STR, "quality")
 
         assert result.line_number is None
         assert result.suggestion is None
@@ -135,84 +151,14 @@ class TestMapFinding:
 class TestProcessReview:
     """Tests for the main process_review function."""
 
-    @patch("app.worker.processor.SettingsRepo")
-    @patch("app.worker.processor.RateLimiter")
-    @patch("app.worker.processor.get_redis_client")
-    @patch("app.worker.processor.GitHubService")
-    @patch("app.worker.processor.ReviewSupervisor")
-    @patch("app.worker.processor.FindingRepo")
-    @patch("app.worker.processor.ReviewRepo")
-    @patch("app.worker.processor.get_db")
-    def test_process_review_success(
-        self,
-        mock_get_db,
-        mock_review_repo_class,
-        mock_finding_repo_class,
-        mock_supervisor_class,
-        mock_github_class,
-        mock_get_redis,
-        mock_rate_limiter_class,
-        mock_settings_repo_class,
-    ):
+    def test_process_review_success(self, worker_mocks):
         """Test successful review processing."""
-        # Setup mocks
-        mock_db = MagicMock()
-        mock_get_db.return_value = mock_db
-
-        mock_review_repo = MagicMock()
-        # get_by_id must return a review object with repository_id for settings lookup
-        mock_review = MagicMock()
-        mock_review.repository_id = "repo-uuid"
-        mock_review_repo.get_by_id.return_value = mock_review
-        mock_review_repo_class.return_value = mock_review_repo
-
-        mock_finding_repo = MagicMock()
-        mock_finding_repo_class.return_value = mock_finding_repo
-
-        # Settings: no settings → defaults (all agents enabled)
-        mock_settings_repo = MagicMock()
-        mock_settings_repo.get_by_repository.return_value = None
-        mock_settings_repo_class.return_value = mock_settings_repo
-
-        mock_github = MagicMock()
-        mock_github.get_pr_diff.return_value = "diff --git a/app.py b/app.py\n+code"
-        mock_github.post_comment.return_value = {"id": 12345}
-        mock_github_class.return_value = mock_github
-
-        mock_supervisor = MagicMock()
-        mock_supervisor.run.return_value = {
-            "logic_findings": [],
-            "security_findings": [
-                AgentFinding(
-                    severity="critical",
-                    file_path="app.py",
-                    title="Issue",
-                    description="Desc",
-                )
-            ],
-            "quality_findings": [],
-            "final_comment": "## Review Comment",
-        }
-        mock_supervisor_class.return_value = mock_supervisor
-
-        mock_redis = MagicMock()
-        mock_get_redis.return_value = mock_redis
-
-        mock_rate_limiter = MagicMock()
-        mock_rate_limiter.can_proceed.return_value = True
-        mock_rate_limiter_class.return_value = mock_rate_limiter
-
-        # Job data
-        job_data = {
-            "review_id": "550e8400-e29b-41d4-a716-446655440000",
-            "owner": "testuser",
-            "repo": "testrepo",
-            "pr_number": 1,
-            "commit_sha": "abc123",
-        }
+        mock_github = worker_mocks["GitHubService"].return_value
+        mock_supervisor = worker_mocks["ReviewSupervisor"].return_value
+        mock_supervisor.run.return_value = _ONE_FINDING_RESULT
 
         # Run
-        process_review(job_data)
+        process_review(_JOB_DATA)
 
         # Verify GitHub was called
         mock_github.get_pr_diff.assert_called_once_with("testuser", "testrepo", 1)
@@ -222,210 +168,53 @@ class TestProcessReview:
         mock_supervisor.run.assert_called_once()
 
         # Verify findings were saved
-        mock_finding_repo.create_many.assert_called_once()
+        worker_mocks["FindingRepo"].return_value.create_many.assert_called_once()
 
         # Verify status updates
+        mock_review_repo = worker_mocks["ReviewRepo"].return_value
         assert mock_review_repo.update_status.call_count == 2  # processing, then completed
 
-    @patch("app.worker.processor.SettingsRepo")
-    @patch("app.worker.processor.RateLimiter")
-    @patch("app.worker.processor.get_redis_client")
-    @patch("app.worker.processor.GitHubService")
-    @patch("app.worker.processor.FindingRepo")
-    @patch("app.worker.processor.ReviewRepo")
-    @patch("app.worker.processor.get_db")
-    def test_process_review_github_error_sets_failed_status(
-        self,
-        mock_get_db,
-        mock_review_repo_class,
-        mock_finding_repo_class,
-        mock_github_class,
-        mock_get_redis,
-        mock_rate_limiter_class,
-        mock_settings_repo_class,
-    ):
-        """Test that GitHub errors result in failed status."""
-        # Setup mocks
-        mock_db = MagicMock()
-        mock_get_db.return_value = mock_db
-
-        mock_review_repo = MagicMock()
-        mock_review = MagicMock()
-        mock_review.repository_id = "repo-uuid"
-        mock_review_repo.get_by_id.return_value = mock_review
-        mock_review_repo_class.return_value = mock_review_repo
-
-        mock_finding_repo = MagicMock()
-        mock_finding_repo_class.return_value = mock_finding_repo
-
-        mock_settings_repo = MagicMock()
-        mock_settings_repo.get_by_repository.return_value = None
-        mock_settings_repo_class.return_value = mock_settings_repo
-
-        mock_github = MagicMock()
-        mock_github.get_pr_diff.side_effect = Exception("GitHub API error")
-        mock_github_class.return_value = mock_github
-
-        mock_redis = MagicMock()
-        mock_get_redis.return_value = mock_redis
-
-        mock_rate_limiter = MagicMock()
-        mock_rate_limiter_class.return_value = mock_rate_limiter
-
-        job_data = {
-            "review_id": "550e8400-e29b-41d4-a716-446655440000",
-            "owner": "testuser",
-            "repo": "testrepo",
-            "pr_number": 1,
-            "commit_sha": "abc123",
-        }
+    def test_process_review_builds_language_specific_supervisor(self, worker_mocks):
+        """Test that the supervisor runs the detected language's agents, not the combined one."""
+        with patch.object(base, "LLMService"):
+            process_review(_JOB_DATA)
+
+        # The diff only touches app.py, so the Python prompts are chosen
+        _, kwargs = worker_mocks["ReviewSupervisor"].call_args
+        assert kwargs["logic_agent"].prompt_template == PYTHON_LOGIC_PROMPT
+        assert kwargs["security_agent"].prompt_template == PYTHON_SECURITY_PROMPT
+        assert kwargs["quality_agent"].prompt_template == PYTHON_QUALITY_PROMPT
+        # The combined agent's generic prompt would bypass these on small diffs
+        assert not kwargs.get("enable_combined", False)
+        assert kwargs.get("combined_agent") is None
+
+    @pytest.mark.parametrize(
+        "patched,method,error",
+        [
+            pytest.param("GitHubService", "get_pr_diff", Exception("GitHub API error"), id="github"),
+            pytest.param("ReviewSupervisor", "run", Exception("LLM error"), id="supervisor"),
+        ],
+    )
+    def test_process_review_error_sets_failed_status(self, worker_mocks, patched, method, error):
+        """Test that GitHub and agent errors result in failed status."""
+        getattr(worker_mocks[patched].return_value, method).side_effect = error
 
         # Run - should not raise
-        process_review(job_data)
-
-        # Verify status was set to failed
-        # Last call should be with FAILED status
-        last_call = mock_review_repo.update_status.call_args_list[-1]
-        assert last_call[0][1] == ReviewStatus.FAILED
-
-    @patch("app.worker.processor.SettingsRepo")
-    @patch("app.worker.processor.RateLimiter")
-    @patch("app.worker.processor.get_redis_client")
-    @patch("app.worker.processor.GitHubService")
-    @patch("app.worker.processor.ReviewSupervisor")
-    @patch("app.worker.processor.FindingRepo")
-    @patch("app.worker.processor.ReviewRepo")
-    @patch("app.worker.processor.get_db")
-    def test_process_review_agent_error_sets_failed_status(
-        self,
-        mock_get_db,
-        mock_review_repo_class,
-        mock_finding_repo_class,
-        mock_supervisor_class,
-        mock_github_class,
-        mock_get_redis,
-        mock_rate_limiter_class,
-        mock_settings_repo_class,
-    ):
-        """Test that agent errors result in failed status."""
-        # Setup mocks
-        mock_db = MagicMock()
-        mock_get_db.return_value = mock_db
-
-        mock_review_repo = MagicMock()
-        mock_review = MagicMock()
-        mock_review.repository_id = "repo-uuid"
-        mock_review_repo.get_by_id.return_value = mock_review
-        mock_review_repo_class.return_value = mock_review_repo
-
-        mock_finding_repo = MagicMock()
-        mock_finding_repo_class.return_value = mock_finding_repo
-
-        mock_settings_repo = MagicMock()
-        mock_settings_repo.get_by_repository.return_value = None
-        mock_settings_repo_class.return_value = mock_settings_repo
-
-        mock_github = MagicMock()
-        mock_github.get_pr_diff.return_value = "diff --git a/app.py b/app.py"
-        mock_github_class.return_value = mock_github
-
-        mock_supervisor = MagicMock()
-        mock_supervisor.run.side_effect = Exception("LLM error")
-        mock_supervisor_class.return_value = mock_supervisor
-
-        mock_redis = MagicMock()
-        mock_get_redis.return_value = mock_redis
-
-        mock_rate_limiter = MagicMock()
-        mock_rate_limiter.can_proceed.return_value = True
-        mock_rate_limiter_class.return_value = mock_rate_limiter
-
-        job_data = {
-            "review_id": "550e8400-e29b-41d4-a716-446655440000",
-            "owner": "testuser",
-            "repo": "testrepo",
-            "pr_number": 1,
-            "commit_sha": "abc123",
-        }
+        process_review(_JOB_DATA)
 
-        # Run - should not raise
-        process_review(job_data)
-
-        # Verify status was set to failed
-        last_call = mock_review_repo.update_status.call_args_list[-1]
-        assert last_call[0][1] == ReviewStatus.FAILED
-
-    @patch("app.worker.processor.time.sleep")
-    @patch("app.worker.processor.SettingsRepo")
-    @patch("app.worker.processor.RateLimiter")
-    @patch("app.worker.processor.get_redis_client")
-    @patch("app.worker.processor.GitHubService")
-    @patch("app.worker.processor.ReviewSupervisor")
-    @patch("app.worker.processor.FindingRepo")
-    @patch("app.worker.processor.ReviewRepo")
-    @patch("app.worker.processor.get_db")
-    def test_process_review_rate_limited_retries(
-        self,
-        mock_get_db,
-        mock_review_repo_class,
-        mock_finding_repo_class,
-        mock_supervisor_class,
-        mock_github_class,
-        mock_get_redis,
-        mock_rate_limiter_class,
-        mock_settings_repo_class,
-        mock_sleep,
-    ):
-        """Test that rate limiting triggers retries."""
-        # Setup mocks
-        mock_db = MagicMock()
-        mock_get_db.return_value = mock_db
-
-        mock_review_repo = MagicMock()
-        mock_review = MagicMock()
-        mock_review.repository_id = "repo-uuid"
-        mock_review_repo.get_by_id.return_value = mock_review
-        mock_review_repo_class.return_value = mock_review_repo
-
-        mock_finding_repo = MagicMock()
-        mock_finding_repo_class.return_value = mock_finding_repo
-
-        mock_settings_repo = MagicMock()
-        mock_settings_repo.get_by_repository.return_value = None
-        mock_settings_repo_class.return_value = mock_settings_repo
-
-        mock_github = MagicMock()
-        mock_github.get_pr_diff.return_value = "diff --git a/app.py b/app.py"
-        mock_github.post_comment.return_value = {"id": 123}
-        mock_github_class.return_value = mock_github
-
-        mock_supervisor = MagicMock()
-        mock_supervisor.run.return_value = {
-            "logic_findings": [],
-            "security_findings": [],
-            "quality_findings": [],
-            "final_comment": "Comment",
-        }
-        mock_supervisor_class.return_value = mock_supervisor
-
-        mock_redis = MagicMock()
-        mock_get_redis.return_value = mock_redis
+        # Verify the last status update set the review to failed
+        mock_review_repo = worker_mocks["ReviewRepo"].return_value
+        mock_review_repo.update_status.assert_called_with(_REVIEW_UUID, ReviewStatus.FAILED)
 
+    def test_process_review_rate_limited_retries(self, worker_mocks):
+        """Test that rate limiting triggers retries."""
         # Rate limiter returns False twice, then True
-        mock_rate_limiter = MagicMock()
+        mock_rate_limiter = worker_mocks["RateLimiter"].return_value
         mock_rate_limiter.can_proceed.side_effect = [False, False, True]
-        mock_rate_limiter_class.return_value = mock_rate_limiter
-
-        job_data = {
-            "review_id": "550e8400-e29b-41d4-a716-446655440000",
-            "owner": "testuser",
-            "repo": "testrepo",
-            "pr_number": 1,
-            "commit_sha": "abc123",
-        }
 
-        # Run
-        process_review(job_data)
+        # Run; a plain Mock is enough to count the retry delays
+        with patch.object(processor.time, "sleep", new_callable=Mock) as mock_sleep:
+            process_review(_JOB_DATA)
 
         # Verify sleep was called for retry delays
         assert mock_sleep.call_count == 2  # Two retries before success